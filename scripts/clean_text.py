@@ -167,21 +167,8 @@ class ChapterDetector:
         self.patterns = self._compile_patterns()
 
     def _compile_patterns(self) -> List[re.Pattern]:
-        """Compile chapter detection patterns from config."""
-        pattern_strings = config.get(
-            "chapters",
-            "patterns",
-            default=[
-                r"^Chapter\s+\d+",
-                r"^CHAPTER\s+\d+",
-                r"^Part\s+\d+",
-            ],
-        )
-
-        return [
-            re.compile(pattern, re.MULTILINE | re.IGNORECASE)
-            for pattern in pattern_strings
-        ]
+        """Chapter detection patterns from config (compiled once when it loads)."""
+        return list(config.chapter_patterns)
 
     def detect_chapters(self, text: str) -> List[dict]:
         """
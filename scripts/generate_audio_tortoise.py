@@ -24,7 +24,7 @@ import subprocess
 import tempfile
 import time
 from pathlib import Path
-from typing import List, Optional, Tuple, Generator
+from typing import Dict, List, Optional, Tuple, Generator
 
 import numpy as np
 import soundfile as sf
@@ -35,7 +35,7 @@ torch.set_num_threads(8)
 torch.set_num_interop_threads(4)
 
 from scripts.utils.config import config
-from scripts.utils import logger
+from scripts.utils import logger, voice_latents
 
 
 class VoiceNotFoundError(Exception):
@@ -122,6 +122,9 @@ class TortoiseTTSGenerator:
         # Lazy load the model
         self._tts = None
 
+        # (voice_samples, conditioning_latents) per voice, loaded once
+        self._voice_cache: Dict[str, Tuple] = {}
+
     def _get_tts(self):
         """Lazy load Tortoise TTS model."""
         if self._tts is None:
@@ -152,57 +155,90 @@ class TortoiseTTSGenerator:
         """
         Load voice samples for voice cloning.
 
+        Tortoise recomputes the conditioning latents from voice_samples on
+        every call they are passed to, so the latents are computed once
+        per voice and reused for every chunk this generator produces.
+        They are also cached on disk through scripts.utils.voice_latents
+        (the same file the read-along generator uses), so later runs skip
+        the conditioning encoders entirely.
+
         Args:
             voice_name: Name of voice (built-in or custom folder name)
 
         Returns:
             Tuple of (voice_samples, conditioning_latents) or (None, None) for built-in
         """
+        if voice_name in self._voice_cache:
+            return self._voice_cache[voice_name]
+
         from tortoise.utils.audio import load_voices
 
-        # Check if custom voice exists
+        # Check if custom voice exists, else fall back to a built-in voice
         custom_voice_dir = self.voices_dir / voice_name
         if custom_voice_dir.exists():
-            voice_samples, conditioning_latents = load_voices(
-                [voice_name],
-                extra_voice_dirs=[str(self.voices_dir)]
+            extra_voice_dirs = [str(self.voices_dir)]
+        elif voice_name in self.BUILTIN_VOICES:
+            extra_voice_dirs = []
+        else:
+            raise VoiceNotFoundError(
+                f"Voice '{voice_name}' not found. "
+                f"Available built-in: {', '.join(self.BUILTIN_VOICES[:10])}... "
+                f"Or create custom voice at: {custom_voice_dir}"
             )
-            return voice_samples, conditioning_latents
 
-        # Use built-in voice
-        if voice_name in self.BUILTIN_VOICES:
-            voice_samples, conditioning_latents = load_voices([voice_name])
-            return voice_samples, conditioning_latents
+        cache_path = self._latents_cache_path(voice_name, extra_voice_dirs)
+        voice = None
+        if cache_path is not None and cache_path.exists():
+            try:
+                voice = (None, voice_latents.read_latents(cache_path))
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable latents cache {cache_path.name}: {e}")
 
-        raise VoiceNotFoundError(
-            f"Voice '{voice_name}' not found. "
-            f"Available built-in: {', '.join(self.BUILTIN_VOICES[:10])}... "
-            f"Or create custom voice at: {custom_voice_dir}"
-        )
+        if voice is None:
+            voice_samples, conditioning_latents = load_voices([voice_name], extra_voice_dirs=extra_voice_dirs)
+            if voice_samples is not None:
+                conditioning_latents = self._get_tts().get_conditioning_latents(voice_samples)
+                if cache_path is not None:
+                    voice_latents.write_latents(voice_name, conditioning_latents, cache_path)
+            voice = (None, conditioning_latents)
+
+        self._voice_cache[voice_name] = voice
+        return voice
+
+    def _latents_cache_path(self, voice_name: str, extra_voice_dirs: List[str]) -> Optional[Path]:
+        """Disk cache file for a voice's latents, or None if it has no clips."""
+        from tortoise.utils.audio import get_voices
+
+        clips = get_voices(extra_voice_dirs=extra_voice_dirs).get(voice_name, [])
+        return voice_latents.cache_path(self.voices_dir, voice_name, clips)
 
     def _normalize(self, audio: np.ndarray) -> np.ndarray:
         """Normalize audio to target dB level."""
         if not self.normalize_audio:
             return audio
 
-        rms = np.sqrt(np.mean(audio ** 2))
+        # Sum of squares via BLAS dot: no audio ** 2 temporary
+        flat = audio.reshape(-1)
+        rms = np.sqrt(np.dot(flat, flat) / flat.size)
         if rms == 0:
             return audio
 
-        current_db = 20 * np.log10(rms)
-        gain_db = self.target_db - current_db
-        gain = 10 ** (gain_db / 20)
+        gain = 10 ** (self.target_db / 20) / rms
 
-        normalized = audio * gain
-        normalized = np.clip(normalized, -1.0, 1.0)
+        # Scale and clip in place (the array is a fresh copy from the model)
+        normalized = np.multiply(audio, gain, out=audio, casting="same_kind")
+        np.clip(normalized, -1.0, 1.0, out=normalized)
 
         return normalized
 
     def _add_silence(self, audio: np.ndarray, seconds: float) -> np.ndarray:
         """Add silence to the end of audio."""
         silence_samples = int(seconds * self.SAMPLE_RATE)
-        silence = np.zeros(silence_samples, dtype=audio.dtype)
-        return np.concatenate([audio, silence])
+
+        # One zeroed buffer with the audio copied in; the tail is the silence
+        padded = np.zeros(len(audio) + silence_samples, dtype=audio.dtype)
+        padded[:len(audio)] = audio
+        return padded
 
     def generate_audio(
         self,
@@ -269,7 +305,7 @@ class TortoiseTTSGenerator:
                 duration = len(audio) / self.SAMPLE_RATE
 
                 # Save to file
-                sf.write(str(output_path), audio, self.SAMPLE_RATE)
+                sf.write(str(output_path), audio, self.SAMPLE_RATE, subtype="PCM_16")
 
                 if show_progress:
                     logger.success(f"Generated: {output_path.name} ({duration:.1f}s)")
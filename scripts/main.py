@@ -492,14 +492,14 @@ def readalong(
     """
     input_path = Path(input_file)
 
-    processor = BookProcessor(voice=voice, preset=preset)
-    result = processor.process_book(
-        input_path,
-        output_dir=Path(output) if output else None,
-        title=title,
-        author=author,
-        skip_chapters=list(skip_chapters) if skip_chapters else None,
-    )
+    with BookProcessor(voice=voice, preset=preset) as processor:
+        result = processor.process_book(
+            input_path,
+            output_dir=Path(output) if output else None,
+            title=title,
+            author=author,
+            skip_chapters=list(skip_chapters) if skip_chapters else None,
+        )
 
     logger.console.print("\n[bold]To use Read-Along:[/bold]")
     logger.console.print(f"  1. Open web/index.html in your browser")
@@ -5,10 +5,27 @@ Provides synchronized audio-text playback with sentence-level highlighting.
 Generates timing maps that link audio timestamps to text positions.
 """
 
+import importlib
+
 from scripts.readalong.sentence_splitter import SentenceSplitter, split_into_sentences
-from scripts.readalong.timed_tts import TimedTTSGenerator
-from scripts.readalong.timing_map import TimingMap, TimingEntry
-from scripts.readalong.book_processor import BookProcessor
+
+# Importing these selects a TTS engine (and loads PDF/audio libraries),
+# so they are only imported when first accessed
+_LAZY_EXPORTS = {
+    "TimedTTSGenerator": "scripts.readalong.timed_tts",
+    "TimingMap": "scripts.readalong.timing_map",
+    "TimingEntry": "scripts.readalong.timing_map",
+    "BookProcessor": "scripts.readalong.book_processor",
+}
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
 
 __all__ = [
     "SentenceSplitter",
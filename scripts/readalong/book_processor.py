@@ -30,7 +30,7 @@ from scripts.extract_text import PDFExtractor
 from scripts.metadata import MetadataExtractor, CoverArtHandler
 from scripts.readalong.sentence_splitter import SentenceSplitter, Sentence
 from scripts.readalong.timed_tts import TimedTTSGenerator, TimedSegment
-from scripts.readalong.timing_map import TimingMap, BookTimingMap, ChapterTiming
+from scripts.readalong.timing_map import TimingMap, BookTimingMap, ChapterTiming, segment_rows
 from scripts.utils.config import config
 from scripts.utils import logger
 
@@ -176,6 +176,16 @@ class BookProcessor:
         self.metadata_extractor = MetadataExtractor()
         self.cover_handler = CoverArtHandler()
 
+    def close(self) -> None:
+        """Shut down the TTS generator's worker pools."""
+        self.tts.close()
+
+    def __enter__(self) -> "BookProcessor":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
     def process_book(
         self,
         input_path: Path,
@@ -356,8 +366,8 @@ class BookProcessor:
                     "audio_path": str(processed.audio_path),
                     "duration": processed.duration,
                     "timing_entries": [
-                        {"id": s.sentence_id, "text": s.text, "start": s.start_time, "end": s.end_time}
-                        for s in processed.segments
+                        {"id": sentence_id, "text": text, "start": start, "end": end}
+                        for sentence_id, text, start, end in segment_rows(processed.segments)
                     ],
                 }
                 state.save(state_path)
@@ -482,6 +492,7 @@ class BookProcessor:
             audio_path,
             chapter_id=chapter_id,
             show_progress=True,
+            sentences=sentences,
         )
 
         # Calculate duration
@@ -658,14 +669,14 @@ def process_readalong(
     Returns:
         ProcessedBook result
     """
-    processor = BookProcessor(voice=voice, preset=preset)
-    return processor.process_book(
-        input_path,
-        output_dir=output_dir,
-        title=title,
-        author=author,
-        resume=resume,
-    )
+    with BookProcessor(voice=voice, preset=preset) as processor:
+        return processor.process_book(
+            input_path,
+            output_dir=output_dir,
+            title=title,
+            author=author,
+            resume=resume,
+        )
 
 
 if __name__ == "__main__":
@@ -30,16 +30,6 @@ _cuda_env = os.environ.get("CUDA_VISIBLE_DEVICES")
 _cuda_disabled = _cuda_env == "-1"  # Only disabled if explicitly set to -1
 _force_cpu = os.environ.get("FORCE_CPU_TTS", "").lower() in ["1", "true", "yes"]
 
-# Check if torch and CUDA are available
-_torch_available = False
-_cuda_available = False
-try:
-    import torch
-    _torch_available = True
-    _cuda_available = torch.cuda.is_available() and not _cuda_disabled
-except ImportError:
-    pass
-
 
 def _try_edge_tts():
     """Try to load edge-tts."""
@@ -61,10 +51,13 @@ def _try_edge_tts():
 def _try_tortoise_tts():
     """Try to load Tortoise TTS (requires GPU)."""
     global _tts_engine, _tts_error
-    if not _torch_available:
+    # torch is only imported when Tortoise is actually being considered
+    try:
+        import torch
+    except ImportError:
         _tts_error = "torch not available"
         return None
-    if not _cuda_available or _force_cpu:
+    if _cuda_disabled or _force_cpu or not torch.cuda.is_available():
         _tts_error = "GPU not available - Tortoise requires GPU"
         return None
     try:
@@ -135,10 +128,10 @@ if _loaded:
 else:
     # No TTS available
     from dataclasses import dataclass
-    from typing import Optional
+    from typing import List, Optional
     import numpy as np
 
-    @dataclass
+    @dataclass(slots=True)
     class TimedSegment:
         """Audio segment with timing information."""
         sentence_id: str
@@ -146,6 +139,8 @@ else:
         start_time: float
         end_time: float
         audio_data: Optional[np.ndarray] = None
+        words: Optional[List[str]] = None
+        word_times: Optional[np.ndarray] = None
 
         @property
         def duration(self) -> float:
@@ -0,0 +1,517 @@
+"""
+Timed TTS Base
+
+Shared pipeline for the timed TTS generators: sentence splitting,
+per-sentence timing, streaming the chapter audio to disk (WAV, or
+MP3/Opus/AAC through an ffmpeg pipe) and normalization. Each engine
+only implements how a single sentence is synthesized.
+"""
+
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import soundfile as sf
+
+from scripts.readalong.sentence_splitter import Sentence, SentenceSplitter
+from scripts.utils.config import config
+from scripts.utils import logger
+
+# Numba is optional: when available, gain and clipping run as one
+# fused parallel pass instead of separate numpy multiply and clip.
+# Importing numba takes a few hundred ms, so it only happens the first
+# time audio is normalized.
+_apply_gain_clip = None
+_numba_checked = False
+
+
+def _gain_clip_kernel():
+    """Return the fused gain+clip kernel, or None without numba."""
+    global _apply_gain_clip, _numba_checked
+    if _numba_checked:
+        return _apply_gain_clip
+    _numba_checked = True
+
+    try:
+        from numba import njit, prange
+    except ImportError:
+        return None
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def apply_gain_clip(audio, gain):
+        for i in prange(audio.shape[0]):
+            v = audio[i] * gain
+            if v > 1.0:
+                v = 1.0
+            elif v < -1.0:
+                v = -1.0
+            audio[i] = v
+
+    _apply_gain_clip = apply_gain_clip
+    return _apply_gain_clip
+
+
+# Word boundaries within a sentence: (word, start, end) in seconds
+# relative to the start of the sentence audio
+WordBoundaries = List[Tuple[str, float, float]]
+
+
+@dataclass(slots=True)
+class TimedSegment:
+    """Audio segment with timing information."""
+
+    sentence_id: str
+    text: str
+    start_time: float
+    end_time: float
+    audio_data: Optional[np.ndarray] = None
+    words: Optional[List[str]] = None  # Words with boundary timings, if known
+    word_times: Optional[np.ndarray] = None  # (n_words, 2) start/end in seconds
+
+    @property
+    def duration(self) -> float:
+        return self.end_time - self.start_time
+
+
+class TimedSegments:
+    """
+    Column-oriented (struct-of-arrays) collection of timed segments.
+
+    Stores ids and texts as lists and start/end times as contiguous
+    float64 arrays. Indexing and iteration yield TimedSegment records,
+    so it can be used anywhere a List[TimedSegment] was expected.
+    """
+
+    def __init__(
+        self,
+        ids: Sequence[str],
+        texts: Sequence[str],
+        start_times: Sequence[float],
+        end_times: Sequence[float],
+        words: Optional[Sequence[Optional[List[str]]]] = None,
+        word_times: Optional[Sequence[Optional[np.ndarray]]] = None,
+    ):
+        self.ids = list(ids)
+        self.texts = list(texts)
+        self.start_times = np.asarray(start_times, dtype=np.float64)
+        self.end_times = np.asarray(end_times, dtype=np.float64)
+        self.words = list(words) if words is not None else [None] * len(self.ids)
+        self.word_times = list(word_times) if word_times is not None else [None] * len(self.ids)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return TimedSegments(
+                self.ids[index],
+                self.texts[index],
+                self.start_times[index],
+                self.end_times[index],
+                self.words[index],
+                self.word_times[index],
+            )
+        return TimedSegment(
+            sentence_id=self.ids[index],
+            text=self.texts[index],
+            start_time=float(self.start_times[index]),
+            end_time=float(self.end_times[index]),
+            words=self.words[index],
+            word_times=self.word_times[index],
+        )
+
+    def __iter__(self):
+        for i in range(len(self.ids)):
+            yield self[i]
+
+    def rows(self) -> Iterator[Tuple[str, str, float, float]]:
+        """Iterate (id, text, start, end) straight from the columns, without building records."""
+        return zip(self.ids, self.texts, self.start_times.tolist(), self.end_times.tolist())
+
+    @property
+    def durations(self) -> np.ndarray:
+        return self.end_times - self.start_times
+
+    def index_at(self, time: float) -> int:
+        """
+        Find the segment being read at a given time.
+
+        Returns the index of the last segment starting at or before
+        `time` (so pauses map to the preceding sentence), or -1 if
+        `time` is before the first segment.
+        """
+        return int(np.searchsorted(self.start_times, time, side="right")) - 1
+
+
+class _FFmpegWriter:
+    """
+    Encode a mono float32 stream by piping 16-bit PCM into ffmpeg.
+
+    Has the write()/context manager interface of sf.SoundFile, so the
+    pipeline can stream to a compressed file without a WAV in between.
+    """
+
+    def __init__(self, path: Path, sample_rate: int, codec: str, bitrate: str):
+        cmd = [
+            "ffmpeg", "-y", "-loglevel", "error",
+            "-f", "s16le", "-ar", str(sample_rate), "-ac", "1", "-i", "-",
+            "-c:a", codec, "-b:a", bitrate,
+            str(path),
+        ]
+        try:
+            self._proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+        except FileNotFoundError:
+            raise RuntimeError("FFmpeg is required for compressed output but not installed")
+
+    def write(self, audio: np.ndarray) -> None:
+        """Convert a float32 block to 16-bit PCM and send it to ffmpeg."""
+        block = np.clip(audio, np.float32(-1.0), np.float32(1.0))
+        block *= np.float32(32767.0)
+        self._proc.stdin.write(np.rint(block, out=block).astype("<i2"))
+
+    def __enter__(self) -> "_FFmpegWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self._proc.kill()
+            self._proc.communicate()
+            return
+
+        _, stderr = self._proc.communicate()
+        if self._proc.returncode != 0:
+            raise RuntimeError(f"FFmpeg encoding failed: {stderr.decode(errors='replace').strip()}")
+
+
+class TimedTTSBase:
+    """
+    Base class for generators that produce audio with per-sentence timing.
+
+    Subclasses set SAMPLE_RATE and ENGINE_NAME and implement
+    _generate_sentence_audio. Engines that can work on several sentences
+    at once, or that report word boundaries, override _iter_sentence_audio.
+    """
+
+    ENGINE_NAME = "TTS"
+    SAMPLE_RATE = 24000
+    SENTENCE_PAUSE = 0.3
+    PARAGRAPH_PAUSE = 0.8
+    WRITE_BLOCK_SIZE = 1 << 18  # Samples per block in the normalization pass
+    GAIN_TOLERANCE_DB = 0.5  # Skip the gain multiply when this close to target
+    # Output suffixes encoded through ffmpeg instead of written as WAV
+    FFMPEG_CODECS = {".mp3": "libmp3lame", ".opus": "libopus", ".m4a": "aac"}
+    ENCODED_BITRATE = "64k"
+
+    # Config is loaded once per process, so its defaults are read once too
+    _DEFAULT_SPEED = config.voice_speed
+
+    def __init__(self, normalize_audio: bool = True, target_db: float = -20.0):
+        """
+        Initialize the shared generator state.
+
+        Args:
+            normalize_audio: Whether to normalize audio levels
+            target_db: Target dB level for normalization
+        """
+        self.normalize_audio = normalize_audio
+        self.target_db = target_db
+
+        self._set_sample_rate(self.SAMPLE_RATE)
+
+    def _set_sample_rate(self, sample_rate: int) -> None:
+        """Set the output sample rate and rebuild the pause buffers for it."""
+        self.SAMPLE_RATE = sample_rate
+
+        # Silence buffers shared by every pause
+        self._sentence_pause = np.zeros(int(self.SENTENCE_PAUSE * self.SAMPLE_RATE), dtype=np.float32)
+        self._paragraph_pause = np.zeros(int(self.PARAGRAPH_PAUSE * self.SAMPLE_RATE), dtype=np.float32)
+
+    def generate_timed_audio(
+        self,
+        text: str,
+        output_path: Path,
+        chapter_id: str = "ch01",
+        show_progress: bool = True,
+        sentences: Optional[List[Sentence]] = None,
+    ) -> Tuple[Path, TimedSegments]:
+        """
+        Generate audio with timing information for each sentence.
+
+        Args:
+            text: Full text to convert
+            output_path: Path for output audio file (.mp3, .opus and .m4a
+                are encoded with ffmpeg, anything else is written as .wav)
+            chapter_id: Chapter identifier for sentence IDs
+            show_progress: Whether to show progress
+            sentences: Sentences already split from text with chapter_id,
+                to avoid splitting the chapter a second time
+
+        Returns:
+            Tuple of (audio file path, timed segments)
+        """
+        output_path = Path(output_path)
+        suffix = output_path.suffix.lower()
+        if suffix != ".wav" and suffix not in self.FFMPEG_CODECS:
+            output_path = output_path.with_suffix(".wav")
+
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Split text into sentences
+        if sentences is None:
+            splitter = SentenceSplitter(chapter_id)
+            sentences = splitter.split(text)
+
+        if not sentences:
+            raise ValueError("No sentences found in text")
+
+        logger.info(f"Processing {len(sentences)} sentences with {self.ENGINE_NAME}...")
+
+        # SAMPLE_RATE must be final before the spool or output is opened
+        self._prepare()
+
+        # Generate audio for each sentence, streaming it straight to disk.
+        # When normalizing, only the sentences' raw audio goes to a spool
+        # file; the second pass applies the gain and writes the pauses.
+        spool_path = output_path.with_name(f"{output_path.stem}.part.wav")
+        # The chapter is built under a temporary name and only replaces
+        # output_path once complete, so a failure never touches a good file
+        # from an earlier run. The suffix is kept so ffmpeg picks the format.
+        temp_path = output_path.with_name(f"{output_path.stem}.tmp{output_path.suffix}")
+
+        # Paragraph breaks are known up front; only the sentence lengths
+        # come from the engine, so timing is derived from them afterwards
+        paragraph_ids = np.fromiter((s.paragraph_id for s in sentences), dtype=np.int64, count=len(sentences))
+        paragraph_breaks = np.zeros(len(sentences), dtype=bool)
+        paragraph_breaks[1:] = paragraph_ids[1:] != paragraph_ids[:-1]
+        num_samples = np.zeros(len(sentences), dtype=np.int64)
+        segment_words = [None] * len(sentences)
+        segment_word_times = [None] * len(sentences)
+        sum_squares = 0.0
+        peak = 0.0
+
+        try:
+            if self.normalize_audio:
+                writer = sf.SoundFile(
+                    str(spool_path),
+                    "w",
+                    samplerate=self.SAMPLE_RATE,
+                    channels=1,
+                    subtype="FLOAT",
+                )
+            else:
+                writer = self._open_output(temp_path)
+
+            with writer as out, logger.create_progress(disable=not show_progress) as progress:
+                task = progress.add_task("Synthesizing sentences", total=len(sentences))
+                sentence_audio = self._iter_sentence_audio(sentences)
+                for i, (audio_data, boundaries) in enumerate(sentence_audio):
+                    # Add paragraph pause if new paragraph
+                    if paragraph_breaks[i] and not self.normalize_audio:
+                        out.write(self._paragraph_pause)
+
+                    # Record length and word boundaries (relative for now)
+                    num_samples[i] = len(audio_data)
+                    if boundaries:
+                        segment_words[i] = [word for word, _, _ in boundaries]
+                        segment_word_times[i] = np.array(
+                            [(start, end) for _, start, end in boundaries], dtype=np.float64
+                        )
+
+                    # Write audio, keeping only its energy for normalization
+                    out.write(audio_data)
+                    sum_squares += float(np.dot(audio_data, audio_data))
+                    peak = max(peak, float(audio_data.max(initial=0.0)), -float(audio_data.min(initial=0.0)))
+
+                    # Add pause between sentences
+                    if not self.normalize_audio:
+                        out.write(self._sentence_pause)
+
+                    progress.update(task, advance=1)
+
+            total_samples = (
+                int(num_samples.sum())
+                + len(sentences) * len(self._sentence_pause)
+                + int(paragraph_breaks.sum()) * len(self._paragraph_pause)
+            )
+
+            # Normalize
+            if self.normalize_audio:
+                gain = self._normalization_gain(sum_squares, total_samples)
+                clip = peak * (1.0 if gain is None else float(gain)) > 1.0
+                layout = list(zip(paragraph_breaks.tolist(), num_samples.tolist()))
+                self._write_normalized(spool_path, temp_path, layout, gain, clip)
+
+            temp_path.replace(output_path)
+        finally:
+            spool_path.unlink(missing_ok=True)
+            temp_path.unlink(missing_ok=True)
+
+        # Each sentence starts after the previous one plus its pause(s)
+        durations = num_samples / self.SAMPLE_RATE
+        gaps = np.where(paragraph_breaks, self.SENTENCE_PAUSE + self.PARAGRAPH_PAUSE, self.SENTENCE_PAUSE)
+        gaps[0] = 0.0
+        end_times = np.cumsum(gaps + durations)
+        start_times = end_times - durations
+        for start_time, word_times in zip(start_times, segment_word_times):
+            if word_times is not None:
+                word_times += start_time
+
+        timed_segments = TimedSegments(
+            [sentence.id for sentence in sentences],
+            [sentence.text for sentence in sentences],
+            start_times,
+            end_times,
+            segment_words,
+            segment_word_times,
+        )
+
+        total_duration = total_samples / self.SAMPLE_RATE
+        logger.success(f"Generated: {output_path.name} ({total_duration:.1f}s, {len(timed_segments)} segments)")
+
+        return output_path, timed_segments
+
+    def _prepare(self) -> None:
+        """
+        Load anything synthesis needs before the chapter's files are opened.
+
+        Engines that only learn their output rate once loaded override
+        this, so SAMPLE_RATE is settled before it goes into a file header.
+        """
+
+    def _iter_sentence_audio(
+        self, sentences: List[Sentence]
+    ) -> Iterator[Tuple[np.ndarray, Optional[WordBoundaries]]]:
+        """
+        Yield (audio, word boundaries) for each sentence in order.
+
+        Uses silence on failure. The base implementation has no word
+        boundaries to report.
+        """
+        for i, sentence in enumerate(sentences):
+            try:
+                yield self._generate_sentence_audio(sentence.text), None
+            except Exception as e:
+                logger.warning(f"Failed to generate audio for sentence {i}: {e}")
+                yield np.zeros(int(0.5 * self.SAMPLE_RATE), dtype=np.float32), None
+
+    def _generate_sentence_audio(self, text: str) -> np.ndarray:
+        """Generate mono float32 audio at SAMPLE_RATE for a single sentence."""
+        raise NotImplementedError
+
+    def _normalization_gain(self, sum_squares: float, num_samples: int) -> Optional[np.float32]:
+        """
+        Compute the gain that brings audio with this energy to target dB.
+
+        Returned as float32 so applying it keeps the audio in float32.
+        Returns None for silence or when the audio is already within
+        GAIN_TOLERANCE_DB of the target.
+        """
+        if num_samples == 0 or sum_squares == 0:
+            return None
+
+        # 10 ** ((target_db - 20 * log10(rms)) / 20) simplifies to a ratio
+        rms = np.sqrt(sum_squares / num_samples)
+        gain = 10 ** (self.target_db / 20) / rms
+
+        # Same as |20 * log10(gain)| < GAIN_TOLERANCE_DB, without the log
+        tolerance = 10 ** (self.GAIN_TOLERANCE_DB / 20)
+        if 1 / tolerance < gain < tolerance:
+            return None
+        return np.float32(gain)
+
+    def _normalize(self, audio: np.ndarray, gain: Optional[np.float32], clip: bool = True) -> np.ndarray:
+        """Apply normalization gain in place and clip to [-1, 1] if needed."""
+        kernel = _gain_clip_kernel() if gain is not None and clip else None
+        if kernel is not None:
+            kernel(audio, gain)
+            return audio
+
+        if gain is not None:
+            np.multiply(audio, gain, out=audio)
+        if clip:
+            np.clip(audio, np.float32(-1.0), np.float32(1.0), out=audio)
+        return audio
+
+    def _write_normalized(
+        self,
+        src_path: Path,
+        dst_path: Path,
+        layout: List[Tuple[bool, int]],
+        gain: Optional[np.float32],
+        clip: bool = True,
+    ) -> None:
+        """
+        Build the final file from the spooled sentences, normalizing block by block.
+
+        The spool holds only sentence audio. Pauses are written here from
+        the shared silence buffers, as laid out by `layout`, so they are
+        never spooled, read back or scaled.
+        """
+        with sf.SoundFile(str(src_path)) as src, self._open_output(dst_path) as out:
+            # Read every block into one preallocated buffer
+            buffer = np.empty(min(self.WRITE_BLOCK_SIZE, src.frames), dtype=np.float32)
+            for paragraph_break, remaining in layout:
+                if paragraph_break:
+                    out.write(self._paragraph_pause)
+                while remaining > 0:
+                    block = src.read(out=buffer[:min(remaining, len(buffer))])
+                    if len(block) == 0:
+                        break
+                    out.write(self._normalize(block, gain, clip))
+                    remaining -= len(block)
+                out.write(self._sentence_pause)
+
+    def _open_output(self, path: Path):
+        """Open the final output: an ffmpeg encoder for compressed suffixes, else a PCM_16 WAV."""
+        codec = self.FFMPEG_CODECS.get(path.suffix.lower())
+        if codec is not None:
+            return _FFmpegWriter(path, self.SAMPLE_RATE, codec, self.ENCODED_BITRATE)
+
+        return sf.SoundFile(
+            str(path),
+            "w",
+            samplerate=self.SAMPLE_RATE,
+            channels=1,
+            subtype="PCM_16",
+        )
+
+    def generate_chapter_timed(
+        self,
+        chapter: dict,
+        output_dir: Path,
+        chapter_num: int,
+    ) -> Tuple[Path, TimedSegments]:
+        """
+        Generate timed audio for a chapter.
+
+        Args:
+            chapter: Chapter dict with 'title' and 'text'
+            output_dir: Output directory
+            chapter_num: Chapter number
+
+        Returns:
+            Tuple of (audio path, timed segments)
+        """
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        chapter_id = f"ch{chapter_num:02d}"
+        output_path = output_dir / f"{chapter_id}.wav"
+
+        logger.step(f"Chapter {chapter_num}: {chapter['title'][:50]}")
+
+        return self.generate_timed_audio(
+            chapter["text"],
+            output_path,
+            chapter_id=chapter_id,
+        )
+
+    def close(self) -> None:
+        """
+        Shut down any worker pools the generator keeps between chapters.
+
+        A no-op for engines that synthesize in-process. The generator can
+        still be used afterwards; pools are recreated on demand.
+        """
@@ -8,35 +8,28 @@ Fast and high-quality - best balance of speed and quality.
 """
 
 import asyncio
-import os
-import tempfile
-from dataclasses import dataclass
+import inspect
+import io
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
+import edge_tts
 import numpy as np
 import soundfile as sf
 
-from scripts.readalong.sentence_splitter import Sentence, SentenceSplitter
-from scripts.utils.config import config
+from scripts.readalong.sentence_splitter import Sentence
+from scripts.readalong.timed_tts_base import (
+    TimedSegment,
+    TimedSegments,
+    TimedTTSBase,
+    WordBoundaries,
+)
 from scripts.utils import logger
 
 
-@dataclass
-class TimedSegment:
-    """Audio segment with timing information."""
-
-    sentence_id: str
-    text: str
-    start_time: float
-    end_time: float
-    audio_data: Optional[np.ndarray] = None
-
-    @property
-    def duration(self) -> float:
-        return self.end_time - self.start_time
-
-
 # Good English voices from Edge TTS
 EDGE_VOICES = {
     "male": "en-US-GuyNeural",
@@ -48,8 +41,67 @@ EDGE_VOICES = {
 
 DEFAULT_VOICE = "en-US-DavisNeural"  # Natural male narrator voice
 
+# edge-tts reports boundary offsets in 100-nanosecond ticks
+_TICKS_PER_SECOND = 10_000_000
+
+# Newer edge-tts releases emit sentence boundaries unless asked for words
+_COMMUNICATE_KWARGS = (
+    {"boundary": "WordBoundary"}
+    if "boundary" in inspect.signature(edge_tts.Communicate).parameters
+    else {}
+)
+
+
+class _BackgroundLoop:
+    """
+    Single event loop running forever on a daemon thread.
+
+    Lets synchronous code submit coroutines without creating a new
+    event loop (or thread) per call, and works the same whether or not
+    the caller already has a running loop (Jupyter, FastAPI, ...).
+    Also owns the MP3 decode pool, so every generator shares one.
+    """
+
+    DECODE_WORKERS = 4  # Threads decoding MP3 while requests are in flight
+
+    _instance: Optional["_BackgroundLoop"] = None
+    _lock = threading.Lock()
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self.loop.run_forever,
+            name="edge-tts-loop",
+            daemon=True,
+        )
+        self._thread.start()
+
+        # soundfile releases the GIL while decoding, so decodes overlap
+        # with network I/O for the sentences that follow
+        self.decode_pool = ThreadPoolExecutor(
+            max_workers=self.DECODE_WORKERS,
+            thread_name_prefix="edge-tts-decode",
+        )
+
+    @classmethod
+    def get(cls) -> "_BackgroundLoop":
+        """Return the shared background loop, starting it on first use."""
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def submit(self, coro) -> Future:
+        """Schedule a coroutine on the background loop without waiting."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro):
+        """Run a coroutine on the background loop and block for its result."""
+        return self.submit(coro).result()
+
 
-class TimedEdgeTTSGenerator:
+class TimedEdgeTTSGenerator(TimedTTSBase):
     """
     Generate audio with per-sentence timing using edge-tts.
 
@@ -57,9 +109,10 @@ class TimedEdgeTTSGenerator:
     High quality and very fast.
     """
 
+    ENGINE_NAME = "Edge TTS"
     SAMPLE_RATE = 24000  # Edge TTS uses 24kHz
-    SENTENCE_PAUSE = 0.3
-    PARAGRAPH_PAUSE = 0.8
+    AUDIO_CACHE_SIZE = 256  # Decoded sentences kept for repeated text
+    PREFETCH = 4  # Sentences requested ahead of the one being written
 
     def __init__(
         self,
@@ -81,18 +134,22 @@ class TimedEdgeTTSGenerator:
             target_db: Target dB level for normalization
             voices_dir: Ignored (for Tortoise compatibility)
         """
+        super().__init__(normalize_audio=normalize_audio, target_db=target_db)
+
         # Handle voice name mapping
         if voice and voice.lower() in EDGE_VOICES:
             self.voice = EDGE_VOICES[voice.lower()]
         else:
             self.voice = voice or DEFAULT_VOICE
 
-        self.speed = speed or config.voice_speed
+        self.speed = speed or self._DEFAULT_SPEED
         self.preset = preset
-        self.normalize_audio = normalize_audio
-        self.target_db = target_db
 
-        self._edge_tts = None
+        # Rate string is fixed for the lifetime of the generator
+        self._rate = self._get_rate_string()
+
+        # LRU cache of decoded audio and word boundaries keyed by (voice, speed, text)
+        self._audio_cache: "OrderedDict[Tuple[str, float, str], Tuple[np.ndarray, WordBoundaries]]" = OrderedDict()
 
     def _get_rate_string(self) -> str:
         """Convert speed multiplier to edge-tts rate string."""
@@ -103,214 +160,114 @@ class TimedEdgeTTSGenerator:
         else:
             return f"{percentage}%"
 
-    async def _generate_audio_async(self, text: str, output_path: str) -> bool:
-        """Generate audio for text using edge-tts asynchronously."""
-        try:
-            import edge_tts
+    async def _generate_audio_async(self, text: str) -> Optional[Tuple[bytes, WordBoundaries]]:
+        """
+        Generate MP3 audio for text using edge-tts asynchronously.
 
-            rate = self._get_rate_string()
-            communicate = edge_tts.Communicate(text, self.voice, rate=rate)
-            await communicate.save(output_path)
-            return True
+        Returns the MP3 bytes and the word boundaries reported alongside
+        them, as (word, start, end) in seconds from the start of the audio.
+        """
+        try:
+            communicate = edge_tts.Communicate(text, self.voice, rate=self._rate, **_COMMUNICATE_KWARGS)
+            audio_chunks = []
+            boundaries = []
+            async for chunk in communicate.stream():
+                if chunk["type"] == "audio":
+                    audio_chunks.append(chunk["data"])
+                elif chunk["type"] == "WordBoundary":
+                    start = chunk["offset"] / _TICKS_PER_SECOND
+                    end = (chunk["offset"] + chunk["duration"]) / _TICKS_PER_SECOND
+                    boundaries.append((chunk["text"], start, end))
+            return b"".join(audio_chunks), boundaries
         except Exception as e:
             logger.warning(f"Edge TTS generation failed: {e}")
-            return False
-
-    def _generate_audio_sync(self, text: str, output_path: str) -> bool:
-        """Synchronous wrapper for audio generation."""
-        try:
-            # Try to get existing event loop
-            loop = asyncio.get_event_loop()
-            if loop.is_running():
-                # We're in an async context, create a new thread
-                import concurrent.futures
-                with concurrent.futures.ThreadPoolExecutor() as executor:
-                    future = executor.submit(
-                        asyncio.run,
-                        self._generate_audio_async(text, output_path)
-                    )
-                    return future.result()
-            else:
-                return loop.run_until_complete(
-                    self._generate_audio_async(text, output_path)
-                )
-        except RuntimeError:
-            # No event loop, create one
-            return asyncio.run(self._generate_audio_async(text, output_path))
-
-    def generate_timed_audio(
-        self,
-        text: str,
-        output_path: Path,
-        chapter_id: str = "ch01",
-        show_progress: bool = True,
-    ) -> Tuple[Path, List[TimedSegment]]:
+            return None
+
+    async def _synthesize_async(self, text: str) -> Optional[Tuple[np.ndarray, WordBoundaries]]:
+        """Fetch and decode audio and word boundaries for one sentence, or None on failure."""
+        result = await self._generate_audio_async(text)
+        if result is None or not result[0]:
+            return None
+
+        mp3_data, boundaries = result
+        loop = asyncio.get_running_loop()
+        decode_pool = _BackgroundLoop.get().decode_pool
+        audio_data = await loop.run_in_executor(decode_pool, self._decode_audio, mp3_data)
+        return audio_data, boundaries
+
+    def _iter_sentence_audio(
+        self, sentences: List[Sentence]
+    ) -> Iterator[Tuple[np.ndarray, Optional[WordBoundaries]]]:
         """
-        Generate audio with timing information for each sentence.
-
-        Args:
-            text: Full text to convert
-            output_path: Path for output audio file
-            chapter_id: Chapter identifier for sentence IDs
-            show_progress: Whether to show progress
+        Yield (audio, word boundaries) for each sentence, in order.
 
-        Returns:
-            Tuple of (audio file path, list of timed segments)
+        Keeps up to PREFETCH sentences in flight on the background loop,
+        so later requests are on the network while earlier ones decode.
+        Repeated text is served from the cache or shares one request.
         """
-        output_path = Path(output_path).with_suffix(".wav")
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-
-        # Split text into sentences
-        splitter = SentenceSplitter(chapter_id)
-        sentences = splitter.split(text)
-
-        if not sentences:
-            raise ValueError("No sentences found in text")
-
-        logger.info(f"Processing {len(sentences)} sentences with Edge TTS...")
-
-        # Generate audio for each sentence
-        timed_segments = []
-        all_audio = []
-        current_time = 0.0
-        last_paragraph = -1
+        background = _BackgroundLoop.get()
+        in_flight: Dict[Tuple[str, float, str], Future] = {}
 
         for i, sentence in enumerate(sentences):
-            if show_progress and (i + 1) % 5 == 0:
-                logger.info(f"  Sentence {i + 1}/{len(sentences)}...")
-
-            # Add paragraph pause if new paragraph
-            if sentence.paragraph_id != last_paragraph and last_paragraph != -1:
-                pause_samples = int(self.PARAGRAPH_PAUSE * self.SAMPLE_RATE)
-                all_audio.append(np.zeros(pause_samples, dtype=np.float32))
-                current_time += self.PARAGRAPH_PAUSE
+            for upcoming in sentences[i:i + self.PREFETCH]:
+                key = (self.voice, self.speed, upcoming.text)
+                if key not in in_flight and key not in self._audio_cache:
+                    in_flight[key] = background.submit(self._synthesize_async(upcoming.text))
 
-            last_paragraph = sentence.paragraph_id
-
-            # Generate audio for this sentence
             try:
-                audio_data = self._generate_sentence_audio(sentence.text)
+                future = in_flight.pop((self.voice, self.speed, sentence.text), None)
+                if future is not None:
+                    result = future.result()
+                    if result is not None:
+                        self._cache_audio(sentence.text, *result)
+                yield self._synthesize_sentence(sentence.text)
             except Exception as e:
                 logger.warning(f"Failed to generate audio for sentence {i}: {e}")
-                audio_data = np.zeros(int(0.5 * self.SAMPLE_RATE), dtype=np.float32)
-
-            # Calculate timing
-            duration = len(audio_data) / self.SAMPLE_RATE
-            start_time = current_time
-            end_time = current_time + duration
-
-            # Create timed segment
-            segment = TimedSegment(
-                sentence_id=sentence.id,
-                text=sentence.text,
-                start_time=start_time,
-                end_time=end_time,
-            )
-            timed_segments.append(segment)
-
-            # Append audio
-            all_audio.append(audio_data)
-            current_time = end_time
-
-            # Add pause between sentences
-            pause_samples = int(self.SENTENCE_PAUSE * self.SAMPLE_RATE)
-            all_audio.append(np.zeros(pause_samples, dtype=np.float32))
-            current_time += self.SENTENCE_PAUSE
-
-        # Concatenate all audio
-        full_audio = np.concatenate(all_audio)
-
-        # Normalize
-        if self.normalize_audio:
-            full_audio = self._normalize(full_audio)
-
-        # Save audio file
-        sf.write(str(output_path), full_audio, self.SAMPLE_RATE)
-
-        total_duration = len(full_audio) / self.SAMPLE_RATE
-        logger.success(f"Generated: {output_path.name} ({total_duration:.1f}s, {len(timed_segments)} segments)")
-
-        return output_path, timed_segments
+                yield np.zeros(int(0.5 * self.SAMPLE_RATE), dtype=np.float32), None
 
     def _generate_sentence_audio(self, text: str) -> np.ndarray:
-        """Generate audio for a single sentence using edge-tts."""
-        # Create temp file for audio output
-        with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as tmp:
-            tmp_path = tmp.name
-
-        try:
-            # Generate audio to file
-            success = self._generate_audio_sync(text, tmp_path)
-
-            if success and os.path.exists(tmp_path) and os.path.getsize(tmp_path) > 0:
-                # Load the audio (edge-tts outputs MP3)
-                audio_data, sr = sf.read(tmp_path)
-
-                # Resample if necessary
-                if sr != self.SAMPLE_RATE:
-                    from scipy import signal
-                    samples = int(len(audio_data) * self.SAMPLE_RATE / sr)
-                    audio_data = signal.resample(audio_data, samples)
-
-                # Convert to mono if stereo
-                if len(audio_data.shape) > 1:
-                    audio_data = audio_data.mean(axis=1)
-
-                return audio_data.astype(np.float32)
-            else:
-                # Return silence if generation failed
-                return np.zeros(int(0.5 * self.SAMPLE_RATE), dtype=np.float32)
-
-        finally:
-            # Clean up temp file
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
-
-    def _normalize(self, audio: np.ndarray) -> np.ndarray:
-        """Normalize audio to target dB level."""
-        rms = np.sqrt(np.mean(audio ** 2))
-        if rms == 0:
-            return audio
-
-        current_db = 20 * np.log10(rms)
-        gain_db = self.target_db - current_db
-        gain = 10 ** (gain_db / 20)
-
-        normalized = audio * gain
-        normalized = np.clip(normalized, -1.0, 1.0)
-
-        return normalized
-
-    def generate_chapter_timed(
-        self,
-        chapter: dict,
-        output_dir: Path,
-        chapter_num: int,
-    ) -> Tuple[Path, List[TimedSegment]]:
-        """
-        Generate timed audio for a chapter.
+        """Generate audio for a single sentence, reusing audio for repeated text."""
+        audio_data, _ = self._synthesize_sentence(text)
+        return audio_data
+
+    def _synthesize_sentence(self, text: str) -> Tuple[np.ndarray, Optional[WordBoundaries]]:
+        """Return (audio, word boundaries) for a sentence, from the cache when possible."""
+        key = (self.voice, self.speed, text)
+        cached = self._audio_cache.get(key)
+        if cached is None:
+            result = _BackgroundLoop.get().run(self._synthesize_async(text))
+            if result is None:
+                # Return silence if generation failed (not cached, so retried next time)
+                return np.zeros(int(0.5 * self.SAMPLE_RATE), dtype=np.float32), None
+            cached = self._cache_audio(text, *result)
+        else:
+            self._audio_cache.move_to_end(key)
 
-        Args:
-            chapter: Chapter dict with 'title' and 'text'
-            output_dir: Output directory
-            chapter_num: Chapter number
+        # Hand out a copy so callers can modify it without touching the cache
+        audio_data, boundaries = cached
+        return audio_data.copy(), boundaries
 
-        Returns:
-            Tuple of (audio path, timed segments)
-        """
-        output_dir = Path(output_dir)
-        output_dir.mkdir(parents=True, exist_ok=True)
+    def _cache_audio(
+        self, text: str, audio_data: np.ndarray, boundaries: WordBoundaries
+    ) -> Tuple[np.ndarray, WordBoundaries]:
+        """Store decoded audio in the LRU cache, evicting the oldest entry."""
+        entry = (audio_data, boundaries)
+        self._audio_cache[(self.voice, self.speed, text)] = entry
+        if len(self._audio_cache) > self.AUDIO_CACHE_SIZE:
+            self._audio_cache.popitem(last=False)
+        return entry
 
-        chapter_id = f"ch{chapter_num:02d}"
-        output_path = output_dir / f"{chapter_id}.wav"
+    def _decode_audio(self, mp3_data: bytes) -> np.ndarray:
+        """Decode edge-tts MP3 bytes to mono float32 at SAMPLE_RATE."""
+        # Decode the MP3 from memory straight to float32
+        audio_data, sr = sf.read(io.BytesIO(mp3_data), dtype="float32")
 
-        logger.step(f"Chapter {chapter_num}: {chapter['title'][:50]}")
+        # edge-tts always requests audio-24khz-48kbitrate-mono-mp3, so the
+        # decoded audio is already mono at SAMPLE_RATE and needs no conversion
+        if sr != self.SAMPLE_RATE or audio_data.ndim != 1:
+            raise ValueError(f"Unexpected edge-tts audio format: {sr} Hz, shape {audio_data.shape}")
 
-        return self.generate_timed_audio(
-            chapter["text"],
-            output_path,
-            chapter_id=chapter_id,
-        )
+        return audio_data
 
 
 # Alias for compatibility
@@ -323,7 +280,7 @@ def generate_with_timing(
     voice: Optional[str] = None,
     preset: str = "fast",
     chapter_id: str = "ch01",
-) -> Tuple[Path, List[TimedSegment]]:
+) -> Tuple[Path, TimedSegments]:
     """
     Convenience function to generate audio with timing.
 
@@ -372,3 +329,5 @@ if __name__ == "__main__":
     print(f"Segments: {len(segments)}")
     for seg in segments:
         print(f"  [{seg.start_time:.2f}-{seg.end_time:.2f}] {seg.text[:50]}...")
+        if seg.words:
+            print(f"    {len(seg.words)} words, first at {seg.word_times[0][0]:.2f}s")
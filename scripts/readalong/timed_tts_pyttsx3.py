@@ -7,36 +7,111 @@ Uses pyttsx3 (system TTS) as a fallback when Tortoise is not available.
 Lower quality than Tortoise but works reliably across systems.
 """
 
+import atexit
+import multiprocessing
+import os
 import tempfile
-import time
-from dataclasses import dataclass
+from concurrent.futures import BrokenExecutor, Future, ProcessPoolExecutor
+from math import gcd
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
 import numpy as np
 import soundfile as sf
 
-from scripts.readalong.sentence_splitter import Sentence, SentenceSplitter
-from scripts.utils.config import config
+from scripts.readalong.sentence_splitter import Sentence
+from scripts.readalong.timed_tts_base import (
+    TimedSegment,
+    TimedSegments,
+    TimedTTSBase,
+    WordBoundaries,
+)
 from scripts.utils import logger
 
 
-@dataclass
-class TimedSegment:
-    """Audio segment with timing information."""
+# pyttsx3 can only render to a file; on Linux keep those files in RAM
+_TEMP_DIR = "/dev/shm" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK) else None
 
-    sentence_id: str
-    text: str
-    start_time: float
-    end_time: float
-    audio_data: Optional[np.ndarray] = None
 
-    @property
-    def duration(self) -> float:
-        return self.end_time - self.start_time
+def _configure_engine(engine, voice: Optional[str], speed: float) -> None:
+    """Apply the voice and speaking rate to a pyttsx3 engine."""
+    # Set voice if specified
+    if voice:
+        voices = engine.getProperty('voices')
+        for v in voices:
+            if voice.lower() in v.id.lower() or voice.lower() in v.name.lower():
+                engine.setProperty('voice', v.id)
+                break
 
+    # Set speed (default is 200 words per minute)
+    base_rate = 200
+    engine.setProperty('rate', int(base_rate * speed))
 
-class TimedPyttsx3TTSGenerator:
+
+def _synthesize_files(engine, texts: List[str]) -> List[Optional[Tuple[np.ndarray, int]]]:
+    """
+    Synthesize several texts through temp WAV files with one runAndWait().
+
+    Every runAndWait() starts and stops the speech service, so the whole
+    batch is queued first and pays that cost once. Returns (mono float32
+    audio, sample rate) per text, or None where the engine produced nothing.
+    """
+    tmp_paths = []
+    try:
+        # Queue one output file per text
+        for text in texts:
+            with tempfile.NamedTemporaryFile(suffix=".wav", dir=_TEMP_DIR, delete=False) as tmp:
+                tmp_paths.append(tmp.name)
+            engine.save_to_file(text, tmp_paths[-1])
+        engine.runAndWait()
+
+        return [_read_output(tmp_path) for tmp_path in tmp_paths]
+
+    finally:
+        # Clean up temp files
+        for tmp_path in tmp_paths:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+
+def _synthesize_file(engine, text: str) -> Optional[Tuple[np.ndarray, int]]:
+    """Synthesize a single text; see _synthesize_files."""
+    return _synthesize_files(engine, [text])[0]
+
+
+def _read_output(path: str) -> Optional[Tuple[np.ndarray, int]]:
+    """Load a rendered WAV as (mono float32 audio, sample rate), or None if empty."""
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return None
+
+    audio_data, sr = sf.read(path, dtype="float32")
+
+    # Convert to mono if stereo (before resampling, so only one channel is filtered)
+    if len(audio_data.shape) > 1:
+        audio_data = audio_data.mean(axis=1)
+
+    return audio_data, sr
+
+
+# Engine owned by each synthesis worker process
+_worker_engine = None
+
+
+def _init_worker(voice: Optional[str], speed: float) -> None:
+    """Create the calling worker process's own pyttsx3 engine."""
+    global _worker_engine
+    import pyttsx3
+
+    _worker_engine = pyttsx3.init()
+    _configure_engine(_worker_engine, voice, speed)
+
+
+def _synthesize_in_worker(texts: List[str]) -> List[Optional[Tuple[np.ndarray, int]]]:
+    """Synthesize a batch of texts with the worker process's engine."""
+    return _synthesize_files(_worker_engine, texts)
+
+
+class TimedPyttsx3TTSGenerator(TimedTTSBase):
     """
     Generate audio with per-sentence timing using pyttsx3.
 
@@ -44,9 +119,12 @@ class TimedPyttsx3TTSGenerator:
     Lower quality than Tortoise but reliable and fast.
     """
 
+    ENGINE_NAME = "pyttsx3 TTS"
     SAMPLE_RATE = 22050  # pyttsx3 typically uses 22050
-    SENTENCE_PAUSE = 0.3
-    PARAGRAPH_PAUSE = 0.8
+    MIN_NATIVE_RATE = 22050  # Engines rendering at least this rate are used as-is
+    # Worker processes synthesizing sentences in parallel (1 disables the pool)
+    SYNTH_WORKERS = max(1, min(4, (os.cpu_count() or 1) // 2))
+    SYNTH_BATCH = 16  # Sentences rendered per runAndWait() call
 
     def __init__(
         self,
@@ -68,13 +146,18 @@ class TimedPyttsx3TTSGenerator:
             target_db: Target dB level for normalization
             voices_dir: Ignored (for Tortoise compatibility)
         """
+        super().__init__(normalize_audio=normalize_audio, target_db=target_db)
+
         self.voice = voice
-        self.speed = speed or config.voice_speed
+        self.speed = speed or self._DEFAULT_SPEED
         self.preset = preset
-        self.normalize_audio = normalize_audio
-        self.target_db = target_db
 
         self._engine = None
+        # Synthesis worker pool, started on first use and kept across chapters
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+        # Anti-aliasing FIR taps per source sample rate, designed once
+        self._resample_taps: Dict[int, np.ndarray] = {}
 
     def _get_engine(self):
         """Lazy load pyttsx3 engine."""
@@ -84,18 +167,8 @@ class TimedPyttsx3TTSGenerator:
 
                 logger.info("Loading pyttsx3 TTS engine...")
                 self._engine = pyttsx3.init()
-
-                # Set voice if specified
-                if self.voice:
-                    voices = self._engine.getProperty('voices')
-                    for v in voices:
-                        if self.voice.lower() in v.id.lower() or self.voice.lower() in v.name.lower():
-                            self._engine.setProperty('voice', v.id)
-                            break
-
-                # Set speed (default is 200 words per minute)
-                base_rate = 200
-                self._engine.setProperty('rate', int(base_rate * self.speed))
+                _configure_engine(self._engine, self.voice, self.speed)
+                self._use_native_rate()
 
                 logger.success("pyttsx3 TTS loaded")
 
@@ -107,185 +180,174 @@ class TimedPyttsx3TTSGenerator:
 
         return self._engine
 
-    def generate_timed_audio(
-        self,
-        text: str,
-        output_path: Path,
-        chapter_id: str = "ch01",
-        show_progress: bool = True,
-    ) -> Tuple[Path, List[TimedSegment]]:
+    def _get_pool(self) -> ProcessPoolExecutor:
         """
-        Generate audio with timing information for each sentence.
+        Start the synthesis worker pool on first use.
 
-        Args:
-            text: Full text to convert
-            output_path: Path for output audio file
-            chapter_id: Chapter identifier for sentence IDs
-            show_progress: Whether to show progress
-
-        Returns:
-            Tuple of (audio file path, list of timed segments)
+        Spawning workers and loading their engines costs more than a short
+        chapter, so the pool is kept for the generator's lifetime. close()
+        shuts it down; atexit does so if the caller never does.
         """
-        output_path = Path(output_path).with_suffix(".wav")
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.SYNTH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.voice, self.speed),
+            )
+            atexit.register(self.close)
+        return self._pool
 
-        # Split text into sentences
-        splitter = SentenceSplitter(chapter_id)
-        sentences = splitter.split(text)
+    def close(self) -> None:
+        """Shut down the synthesis worker pool, if one was started."""
+        if self._pool is not None:
+            atexit.unregister(self.close)
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
 
-        if not sentences:
-            raise ValueError("No sentences found in text")
+    def _prepare(self) -> None:
+        """Load the engine now, since loading it can change SAMPLE_RATE."""
+        self._get_engine()
 
-        logger.info(f"Processing {len(sentences)} sentences with pyttsx3 TTS...")
+    def _use_native_rate(self) -> None:
+        """
+        Write chapters at the engine's own output rate when it is good enough.
 
-        # Generate audio for each sentence
-        timed_segments = []
-        all_audio = []
-        current_time = 0.0
-        last_paragraph = -1
+        pyttsx3 cannot be asked for a sample rate, so a short probe is
+        rendered once. If the engine produces at least MIN_NATIVE_RATE,
+        that becomes SAMPLE_RATE and sentences skip resampling entirely.
+        """
+        result = _synthesize_file(self._engine, "Probe.")
+        if result is None:
+            return
+
+        native_rate = result[1]
+        if native_rate >= self.MIN_NATIVE_RATE and native_rate != self.SAMPLE_RATE:
+            logger.info(f"Using pyttsx3 native sample rate ({native_rate} Hz)")
+            self._set_sample_rate(native_rate)
+
+    def _iter_sentence_audio(
+        self, sentences: List[Sentence]
+    ) -> Iterator[Tuple[np.ndarray, Optional[WordBoundaries]]]:
+        """Yield audio for each sentence, synthesized in parallel when workers are enabled."""
+        # Load the engine up front so a missing install fails loudly
+        self._get_engine()
+
+        # Short texts finish before a pool would even start
+        if self.SYNTH_WORKERS <= 1 or len(sentences) < 2 * self.SYNTH_WORKERS:
+            return self._iter_batched(sentences)
+        return self._iter_parallel(sentences)
+
+    def _iter_batched(
+        self, sentences: List[Sentence]
+    ) -> Iterator[Tuple[np.ndarray, Optional[WordBoundaries]]]:
+        """
+        Synthesize sentences in-process, SYNTH_BATCH per runAndWait() call.
 
+        A batch that fails as a whole is retried one sentence at a time,
+        so a single bad sentence only costs its own audio.
+        """
         engine = self._get_engine()
 
-        for i, sentence in enumerate(sentences):
-            if show_progress and (i + 1) % 10 == 0:
-                logger.info(f"  Sentence {i + 1}/{len(sentences)}...")
-
-            # Add paragraph pause if new paragraph
-            if sentence.paragraph_id != last_paragraph and last_paragraph != -1:
-                pause_samples = int(self.PARAGRAPH_PAUSE * self.SAMPLE_RATE)
-                all_audio.append(np.zeros(pause_samples, dtype=np.float32))
-                current_time += self.PARAGRAPH_PAUSE
-
-            last_paragraph = sentence.paragraph_id
-
-            # Generate audio for this sentence
+        for start in range(0, len(sentences), self.SYNTH_BATCH):
+            batch = sentences[start:start + self.SYNTH_BATCH]
             try:
-                audio_data = self._generate_sentence_audio(sentence.text, engine)
+                results = _synthesize_files(engine, [sentence.text for sentence in batch])
             except Exception as e:
-                logger.warning(f"Failed to generate audio for sentence {i}: {e}")
-                audio_data = np.zeros(int(0.5 * self.SAMPLE_RATE), dtype=np.float32)
-
-            # Calculate timing
-            duration = len(audio_data) / self.SAMPLE_RATE
-            start_time = current_time
-            end_time = current_time + duration
-
-            # Create timed segment
-            segment = TimedSegment(
-                sentence_id=sentence.id,
-                text=sentence.text,
-                start_time=start_time,
-                end_time=end_time,
-            )
-            timed_segments.append(segment)
-
-            # Append audio
-            all_audio.append(audio_data)
-            current_time = end_time
-
-            # Add pause between sentences
-            pause_samples = int(self.SENTENCE_PAUSE * self.SAMPLE_RATE)
-            all_audio.append(np.zeros(pause_samples, dtype=np.float32))
-            current_time += self.SENTENCE_PAUSE
-
-        # Concatenate all audio
-        full_audio = np.concatenate(all_audio)
-
-        # Normalize
-        if self.normalize_audio:
-            full_audio = self._normalize(full_audio)
-
-        # Save audio file
-        sf.write(str(output_path), full_audio, self.SAMPLE_RATE)
-
-        total_duration = len(full_audio) / self.SAMPLE_RATE
-        logger.success(f"Generated: {output_path.name} ({total_duration:.1f}s, {len(timed_segments)} segments)")
-
-        return output_path, timed_segments
+                logger.warning(f"Failed to generate audio batch at sentence {start} ({e}), retrying per sentence")
+                yield from super()._iter_sentence_audio(batch)
+                continue
 
-    def _generate_sentence_audio(self, text: str, engine) -> np.ndarray:
-        """Generate audio for a single sentence using pyttsx3."""
-        import tempfile
-        import os
+            for result in results:
+                yield self._to_sentence_audio(result), None
 
-        # Create temp file for audio output
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-            tmp_path = tmp.name
+    def _iter_parallel(
+        self, sentences: List[Sentence]
+    ) -> Iterator[Tuple[np.ndarray, Optional[WordBoundaries]]]:
+        """
+        Synthesize batches of sentences in a process pool, yielding them in order.
+
+        pyttsx3 engines are not thread-safe and the espeak driver is a
+        process-wide singleton, so every worker is a separate (spawned)
+        process with its own engine. The pool is reused across chapters.
+        Batches are shrunk for short chapters so every worker still gets
+        work, 2 * SYNTH_WORKERS batches are kept queued ahead, and the rest
+        finishes in-process if the pool breaks.
+        """
+        window = 2 * self.SYNTH_WORKERS
+        batch_size = max(1, min(self.SYNTH_BATCH, len(sentences) // window))
+        batches = [
+            sentences[start:start + batch_size]
+            for start in range(0, len(sentences), batch_size)
+        ]
+        futures: Dict[int, Future] = {}
+        pool = self._get_pool()
 
         try:
-            # Generate audio to file
-            engine.save_to_file(text, tmp_path)
-            engine.runAndWait()
-
-            # Load the audio
-            if os.path.exists(tmp_path) and os.path.getsize(tmp_path) > 0:
-                audio_data, sr = sf.read(tmp_path)
-
-                # Resample if necessary
-                if sr != self.SAMPLE_RATE:
-                    from scipy import signal
-                    samples = int(len(audio_data) * self.SAMPLE_RATE / sr)
-                    audio_data = signal.resample(audio_data, samples)
-
-                # Convert to mono if stereo
-                if len(audio_data.shape) > 1:
-                    audio_data = audio_data.mean(axis=1)
-
-                return audio_data.astype(np.float32)
-            else:
-                # Return silence if generation failed
-                return np.zeros(int(0.5 * self.SAMPLE_RATE), dtype=np.float32)
-
+            for i, batch in enumerate(batches):
+                for j in range(i, min(i + window, len(batches))):
+                    if j not in futures:
+                        texts = [sentence.text for sentence in batches[j]]
+                        futures[j] = pool.submit(_synthesize_in_worker, texts)
+
+                try:
+                    results = futures.pop(i).result()
+                except BrokenExecutor as e:
+                    # A broken pool can't be reused; the next chapter starts a new one
+                    logger.warning(f"pyttsx3 worker pool failed ({e}), continuing in-process")
+                    self.close()
+                    yield from self._iter_batched(sentences[i * batch_size:])
+                    return
+                except Exception as e:
+                    logger.warning(f"Failed to generate audio batch at sentence {i * batch_size} ({e}), retrying in-process")
+                    yield from self._iter_batched(batch)
+                    continue
+
+                for result in results:
+                    yield self._to_sentence_audio(result), None
         finally:
-            # Clean up temp file
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
+            # Don't leave an abandoned chapter's batches queued on the shared pool
+            for future in futures.values():
+                future.cancel()
 
-    def _normalize(self, audio: np.ndarray) -> np.ndarray:
-        """Normalize audio to target dB level."""
-        rms = np.sqrt(np.mean(audio ** 2))
-        if rms == 0:
-            return audio
+    def _generate_sentence_audio(self, text: str) -> np.ndarray:
+        """Generate audio for a single sentence using pyttsx3."""
+        return self._to_sentence_audio(_synthesize_file(self._get_engine(), text))
 
-        current_db = 20 * np.log10(rms)
-        gain_db = self.target_db - current_db
-        gain = 10 ** (gain_db / 20)
+    def _to_sentence_audio(self, result: Optional[Tuple[np.ndarray, int]]) -> np.ndarray:
+        """Bring synthesized (audio, sample rate) to SAMPLE_RATE, or silence if there is none."""
+        if result is None:
+            # Return silence if generation failed
+            return np.zeros(int(0.5 * self.SAMPLE_RATE), dtype=np.float32)
 
-        normalized = audio * gain
-        normalized = np.clip(normalized, -1.0, 1.0)
+        audio_data, sr = result
 
-        return normalized
+        # Resample if necessary
+        if sr != self.SAMPLE_RATE:
+            audio_data = self._resample(audio_data, sr)
 
-    def generate_chapter_timed(
-        self,
-        chapter: dict,
-        output_dir: Path,
-        chapter_num: int,
-    ) -> Tuple[Path, List[TimedSegment]]:
-        """
-        Generate timed audio for a chapter.
+        return audio_data.astype(np.float32, copy=False)
 
-        Args:
-            chapter: Chapter dict with 'title' and 'text'
-            output_dir: Output directory
-            chapter_num: Chapter number
+    def _resample(self, audio_data: np.ndarray, sr: int) -> np.ndarray:
+        """
+        Resample from sr to SAMPLE_RATE with a polyphase filter.
 
-        Returns:
-            Tuple of (audio path, timed segments)
+        Unlike FFT resampling, the cost does not depend on the length's
+        prime factors. The filter is the one resample_poly designs by
+        default, built once per source rate and reused.
         """
-        output_dir = Path(output_dir)
-        output_dir.mkdir(parents=True, exist_ok=True)
+        from scipy.signal import firwin, resample_poly
 
-        chapter_id = f"ch{chapter_num:02d}"
-        output_path = output_dir / f"{chapter_id}.wav"
+        g = gcd(sr, self.SAMPLE_RATE)
+        up, down = self.SAMPLE_RATE // g, sr // g
 
-        logger.step(f"Chapter {chapter_num}: {chapter['title'][:50]}")
+        taps = self._resample_taps.get(sr)
+        if taps is None:
+            max_rate = max(up, down)
+            taps = firwin(2 * 10 * max_rate + 1, 1.0 / max_rate, window=("kaiser", 5.0))
+            self._resample_taps[sr] = taps
 
-        return self.generate_timed_audio(
-            chapter["text"],
-            output_path,
-            chapter_id=chapter_id,
-        )
+        return resample_poly(audio_data, up, down, window=taps)
 
 
 # Alias for compatibility
@@ -298,7 +360,7 @@ def generate_with_timing(
     voice: Optional[str] = None,
     preset: str = "fast",
     chapter_id: str = "ch01",
-) -> Tuple[Path, List[TimedSegment]]:
+) -> Tuple[Path, TimedSegments]:
     """
     Convenience function to generate audio with timing.
 
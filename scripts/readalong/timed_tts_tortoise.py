@@ -6,36 +6,53 @@ Captures start/end timestamps for Read-Along synchronization.
 Uses Tortoise TTS for high-quality, natural speech synthesis.
 """
 
-import tempfile
-import time
-from dataclasses import dataclass
+import atexit
+import inspect
+import multiprocessing
+import re
+from collections import OrderedDict
+from concurrent.futures import BrokenExecutor, Future, ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import numpy as np
-import soundfile as sf
 
-from scripts.readalong.sentence_splitter import Sentence, SentenceSplitter
+from scripts.readalong.sentence_splitter import Sentence
+from scripts.readalong.timed_tts_base import (
+    TimedSegment,
+    TimedSegments,
+    TimedTTSBase,
+    WordBoundaries,
+)
 from scripts.utils.config import config
-from scripts.utils import logger
+from scripts.utils import logger, voice_latents
 
+# Phrase breaks used to split sentences that are too long for one TTS call
+_CHUNK_SPLIT_RE = re.compile(r'([,;:\-\u2014])\s*')
+_CHUNK_DELIMITERS = frozenset(",;:-\u2014")
 
-@dataclass
-class TimedSegment:
-    """Audio segment with timing information."""
 
-    sentence_id: str
-    text: str
-    start_time: float
-    end_time: float
-    audio_data: Optional[np.ndarray] = None
+# Generator owned by each multi-GPU worker process
+_worker_generator = None
 
-    @property
-    def duration(self) -> float:
-        return self.end_time - self.start_time
 
+def _init_worker(kwargs: Dict[str, Any], devices) -> None:
+    """Bind the calling worker process to its GPU and load Tortoise there."""
+    global _worker_generator
+    import torch
 
-class TimedTortoiseTTSGenerator:
+    # Tortoise places its models on the current CUDA device
+    torch.cuda.set_device(devices.get())
+    _worker_generator = TimedTortoiseTTSGenerator(**kwargs)
+    _worker_generator._get_tts()
+
+
+def _generate_in_worker(texts: List[str]) -> List[np.ndarray]:
+    """Generate a batch of sentences with the worker process's generator."""
+    return _worker_generator._generate_batch_audio(texts)
+
+
+class TimedTortoiseTTSGenerator(TimedTTSBase):
     """
     Generate audio with per-sentence timing using Tortoise TTS.
 
@@ -43,9 +60,14 @@ class TimedTortoiseTTSGenerator:
     for Read-Along synchronization.
     """
 
+    ENGINE_NAME = "Tortoise TTS"
     SAMPLE_RATE = 24000
-    SENTENCE_PAUSE = 0.3
-    PARAGRAPH_PAUSE = 0.8
+    BATCH_SIZE = 8  # Sentences per prefetched work unit (still one Tortoise call each)
+    CLEANUP_INTERVAL = 32  # TTS calls between gc.collect / CUDA cache releases
+    AUDIO_CACHE_SIZE = 256  # Generated sentences kept for repeated text
+
+    _DEFAULT_VOICE = config.get("voice", "default", default="train_dotrice")
+    _DEFAULT_VOICES_DIR = config.project_root / "voices"
 
     def __init__(
         self,
@@ -55,6 +77,9 @@ class TimedTortoiseTTSGenerator:
         normalize_audio: bool = True,
         target_db: float = -20.0,
         voices_dir: Optional[Path] = None,
+        ar_batch_size: Optional[int] = None,
+        compile_model: bool = False,
+        half_precision: bool = True,
     ):
         """
         Initialize the timed Tortoise TTS generator.
@@ -66,34 +91,52 @@ class TimedTortoiseTTSGenerator:
             normalize_audio: Whether to normalize audio levels
             target_db: Target dB level for normalization
             voices_dir: Directory containing custom voice samples
+            ar_batch_size: Autoregressive batch size; None lets Tortoise
+                pick one from the available GPU memory
+            compile_model: Compile the autoregressive decoder with
+                torch.compile (slow first sentence, faster afterwards)
+            half_precision: Run inference in fp16 on CUDA devices
         """
-        self.voice = voice or config.get("voice", "default", default="train_dotrice")
-        self.speed = speed or config.voice_speed
+        super().__init__(normalize_audio=normalize_audio, target_db=target_db)
+
+        self.voice = voice or self._DEFAULT_VOICE
+        self.speed = speed or self._DEFAULT_SPEED
         self.preset = preset
-        self.normalize_audio = normalize_audio
-        self.target_db = target_db
-        self.voices_dir = voices_dir or config.project_root / "voices"
+        self.voices_dir = voices_dir or self._DEFAULT_VOICES_DIR
+        self.ar_batch_size = ar_batch_size
+        self.compile_model = compile_model
+        self.half_precision = half_precision
 
         self._tts = None
         self._voice_samples = None
         self._conditioning_latents = None
+        self._calls_since_cleanup = 0
+        # One worker process per GPU, started on first use and kept across chapters
+        self._gpu_pool: Optional[ProcessPoolExecutor] = None
+
+        # LRU cache of sentence audio keyed by (voice, preset, normalized text)
+        self._audio_cache: "OrderedDict[Tuple[str, str, str], np.ndarray]" = OrderedDict()
 
     def _get_tts(self):
         """Lazy load Tortoise TTS model."""
         if self._tts is None:
             try:
                 from tortoise.api import TextToSpeech
-                from tortoise.utils.audio import load_voices
 
                 logger.info(f"Loading Tortoise TTS (voice: {self.voice})...")
-                self._tts = TextToSpeech()
+                # The autoregressive batch size is the main throughput dial
+                self._tts = TextToSpeech(
+                    autoregressive_batch_size=self.ar_batch_size,
+                    **self._tts_options(TextToSpeech),
+                )
+                self.ar_batch_size = self._tts.autoregressive_batch_size
+                logger.info(f"Autoregressive batch size: {self.ar_batch_size}")
+
+                if self.compile_model:
+                    self._compile_autoregressive()
 
                 # Load voice
-                extra_dirs = [str(self.voices_dir)] if self.voices_dir.exists() else []
-                self._voice_samples, self._conditioning_latents = load_voices(
-                    [self.voice],
-                    extra_voice_dirs=extra_dirs
-                )
+                self._voice_samples, self._conditioning_latents = self._load_voice()
 
                 logger.success("Tortoise TTS loaded")
 
@@ -105,117 +148,275 @@ class TimedTortoiseTTSGenerator:
 
         return self._tts
 
-    def generate_timed_audio(
-        self,
-        text: str,
-        output_path: Path,
-        chapter_id: str = "ch01",
-        show_progress: bool = True,
-    ) -> Tuple[Path, List[TimedSegment]]:
+    def _tts_options(self, tts_class) -> Dict[str, Any]:
         """
-        Generate audio with timing information for each sentence.
+        Extra TextToSpeech arguments supported by the installed Tortoise.
 
-        Args:
-            text: Full text to convert
-            output_path: Path for output audio file
-            chapter_id: Chapter identifier for sentence IDs
-            show_progress: Whether to show progress
+        The KV cache stops the autoregressive decoder from re-running
+        attention over the whole sequence at every step, and half runs
+        the decoder and diffusion model under fp16 autocast on tensor
+        cores. Both are off by default and older releases do not accept
+        the arguments.
+        """
+        import torch
 
-        Returns:
-            Tuple of (audio file path, list of timed segments)
+        supported = inspect.signature(tts_class).parameters
+        options = {}
+        if "kv_cache" in supported:
+            options["kv_cache"] = True
+        if "half" in supported and self.half_precision and torch.cuda.is_available():
+            options["half"] = True
+        return options
+
+    def _compile_autoregressive(self) -> None:
+        """
+        Compile the forward pass of the autoregressive decoder's per-step model.
+
+        Only forward is replaced: HF generate() calls self(...), which picks
+        up the instance attribute, whereas wrapping the whole module would
+        leave generate() running the eager forward. Dynamic shapes keep the
+        growing KV cache from forcing a recompile at every length.
+        Compilation happens on the first sentence; on any failure the eager
+        model is kept.
         """
         import torch
 
-        output_path = Path(output_path).with_suffix(".wav")
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+        inference_model = getattr(self._tts.autoregressive, "inference_model", None)
+        if inference_model is None or not hasattr(torch, "compile"):
+            logger.warning("torch.compile not available for this Tortoise install, running eagerly")
+            return
 
-        # Split text into sentences
-        splitter = SentenceSplitter(chapter_id)
-        sentences = splitter.split(text)
+        try:
+            inference_model.forward = torch.compile(
+                inference_model.forward, mode="reduce-overhead", dynamic=True
+            )
+            logger.info("Compiled the Tortoise autoregressive decoder")
+        except Exception as e:
+            logger.warning(f"Could not compile the autoregressive decoder: {e}")
 
-        if not sentences:
-            raise ValueError("No sentences found in text")
+    def _load_voice(self):
+        """
+        Load (voice_samples, conditioning_latents) for the configured voice.
 
-        logger.info(f"Processing {len(sentences)} sentences with Tortoise TTS...")
+        Tortoise recomputes the latents from voice_samples on every call
+        when samples are passed, so the latents are computed once, cached
+        next to the custom voices (see scripts.utils.voice_latents), and
+        used on their own.
+        """
+        from tortoise.utils.audio import get_voices, load_voices
 
-        # Generate audio for each sentence
-        timed_segments = []
-        all_audio = []
-        current_time = 0.0
-        last_paragraph = -1
+        extra_dirs = [str(self.voices_dir)] if self.voices_dir.exists() else []
+        clips = get_voices(extra_voice_dirs=extra_dirs).get(self.voice, [])
+        cache_path = voice_latents.cache_path(self.voices_dir, self.voice, clips)
+        if cache_path is None:
+            # Random or unknown voice: nothing to cache
+            return load_voices([self.voice], extra_voice_dirs=extra_dirs)
 
-        tts = self._get_tts()
+        if cache_path.exists():
+            try:
+                return None, voice_latents.read_latents(cache_path)
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable latents cache {cache_path.name}: {e}")
 
-        for i, sentence in enumerate(sentences):
-            if show_progress and (i + 1) % 5 == 0:
-                logger.info(f"  Sentence {i + 1}/{len(sentences)}...")
+        voice_samples, conditioning_latents = load_voices([self.voice], extra_voice_dirs=extra_dirs)
+        if conditioning_latents is None:
+            conditioning_latents = self._tts.get_conditioning_latents(voice_samples)
 
-            # Add paragraph pause if new paragraph
-            if sentence.paragraph_id != last_paragraph and last_paragraph != -1:
-                pause_samples = int(self.PARAGRAPH_PAUSE * self.SAMPLE_RATE)
-                all_audio.append(np.zeros(pause_samples, dtype=np.float32))
-                current_time += self.PARAGRAPH_PAUSE
+        voice_latents.write_latents(self.voice, conditioning_latents, cache_path)
+        return None, conditioning_latents
 
-            last_paragraph = sentence.paragraph_id
+    # Maximum characters per TTS call to prevent OOM errors
+    MAX_CHARS_PER_CHUNK = 200
 
-            # Generate audio for this sentence
-            try:
-                audio_data = self._generate_sentence_audio(sentence.text, tts)
-            except Exception as e:
-                logger.warning(f"Failed to generate audio for sentence {i}: {e}")
-                audio_data = np.zeros(int(0.5 * self.SAMPLE_RATE), dtype=np.float32)
-
-            # Calculate timing
-            duration = len(audio_data) / self.SAMPLE_RATE
-            start_time = current_time
-            end_time = current_time + duration
-
-            # Create timed segment
-            segment = TimedSegment(
-                sentence_id=sentence.id,
-                text=sentence.text,
-                start_time=start_time,
-                end_time=end_time,
-            )
-            timed_segments.append(segment)
+    def _iter_sentence_audio(
+        self, sentences: List[Sentence]
+    ) -> Iterator[Tuple[np.ndarray, Optional[WordBoundaries]]]:
+        """
+        Yield audio for each sentence, prefetching BATCH_SIZE sentences ahead.
 
-            # Append audio
-            all_audio.append(audio_data)
-            current_time = end_time
+        Tortoise still synthesizes one sentence per call; the groups are
+        only the unit of work. With several GPUs they are spread over one
+        worker process per device. Otherwise the next group is generated
+        on a worker thread while the current one is being written, so the
+        GPU is not idle during file I/O and normalization bookkeeping.
+        """
+        batches = [
+            [sentence.text for sentence in sentences[start:start + self.BATCH_SIZE]]
+            for start in range(0, len(sentences), self.BATCH_SIZE)
+        ]
+
+        # Once a model is loaded in this process (e.g. after the GPU pool
+        # failed) it stays on the single-device path, so the parent never
+        # competes with worker processes for GPU memory
+        num_gpus = self._gpu_count()
+        if num_gpus > 1 and len(batches) > 1 and self._tts is None:
+            yield from self._iter_multi_gpu(batches, num_gpus)
+            return
+
+        # Load the model up front so a missing install fails loudly
+        self._get_tts()
+
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="tortoise-tts") as pool:
+            pending = pool.submit(self._generate_batch_audio, batches[0]) if batches else None
+            for k in range(len(batches)):
+                audio_batch = pending.result()
+                if k + 1 < len(batches):
+                    pending = pool.submit(self._generate_batch_audio, batches[k + 1])
+                for audio in audio_batch:
+                    yield audio, None
+
+        # Leave memory tidy between chapters
+        self._release_memory(force=True)
+
+    @staticmethod
+    def _gpu_count() -> int:
+        """Number of visible CUDA devices (0 without torch or CUDA)."""
+        try:
+            import torch
+        except ImportError:
+            return 0
+        return torch.cuda.device_count() if torch.cuda.is_available() else 0
+
+    def _iter_multi_gpu(
+        self, batches: List[List[str]], num_gpus: int
+    ) -> Iterator[Tuple[np.ndarray, Optional[WordBoundaries]]]:
+        """
+        Generate batches in one spawned process per GPU, yielding them in order.
 
-            # Add pause between sentences
-            pause_samples = int(self.SENTENCE_PAUSE * self.SAMPLE_RATE)
-            all_audio.append(np.zeros(pause_samples, dtype=np.float32))
-            current_time += self.SENTENCE_PAUSE
+        Keeps 2 * num_gpus batches queued ahead. A batch whose worker
+        raised is resubmitted once; if that fails too, or the pool breaks,
+        the pool is shut down before the rest is generated in-process.
+        """
+        pool = self._get_gpu_pool(num_gpus)
+        window = 2 * num_gpus
+        futures: Dict[int, Future] = {}
+
+        try:
+            for i, texts in enumerate(batches):
+                for j in range(i, min(i + window, len(batches))):
+                    if j not in futures:
+                        futures[j] = pool.submit(_generate_in_worker, batches[j])
+
+                try:
+                    audio_batch = self._gpu_batch_result(pool, futures.pop(i), texts)
+                except Exception as e:
+                    # Only load a model here once the workers have released the GPUs
+                    logger.warning(f"Tortoise GPU worker pool failed ({e}), continuing in-process")
+                    self.close()
+                    self._get_tts()
+                    for rest in batches[i:]:
+                        for audio in self._generate_batch_audio(rest):
+                            yield audio, None
+                    return
+
+                for audio in audio_batch:
+                    yield audio, None
+        finally:
+            # Don't leave an abandoned chapter's batches queued on the shared pool
+            for future in futures.values():
+                future.cancel()
+
+    @staticmethod
+    def _gpu_batch_result(
+        pool: ProcessPoolExecutor, future: Future, texts: List[str]
+    ) -> List[np.ndarray]:
+        """Wait for a worker batch, resubmitting it once if the worker raised."""
+        try:
+            return future.result()
+        except BrokenExecutor:
+            raise
+        except Exception as e:
+            logger.warning(f"Tortoise GPU worker failed on a batch ({e}), resubmitting it")
+            return pool.submit(_generate_in_worker, texts).result()
+
+    def _get_gpu_pool(self, num_gpus: int) -> ProcessPoolExecutor:
+        """
+        Start one spawned worker process per GPU on first use.
 
-        # Concatenate all audio
-        full_audio = np.concatenate(all_audio)
+        Each worker loads its own model and voice latents on its device
+        (the latents come from the on-disk cache after the first). That
+        costs more than a short chapter, so the pool is kept for the
+        generator's lifetime. close() shuts it down; atexit does so if the
+        caller never does.
+        """
+        if self._gpu_pool is None:
+            kwargs = {
+                "voice": self.voice,
+                "speed": self.speed,
+                "preset": self.preset,
+                "voices_dir": self.voices_dir,
+                "ar_batch_size": self.ar_batch_size,
+                "compile_model": self.compile_model,
+                "half_precision": self.half_precision,
+            }
+            context = multiprocessing.get_context("spawn")
+            devices = context.Queue()
+            for device in range(num_gpus):
+                devices.put(device)
+
+            logger.info(f"Generating on {num_gpus} GPUs")
+            self._gpu_pool = ProcessPoolExecutor(
+                max_workers=num_gpus,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(kwargs, devices),
+            )
+            atexit.register(self.close)
+        return self._gpu_pool
 
-        # Normalize
-        if self.normalize_audio:
-            full_audio = self._normalize(full_audio)
+    def close(self) -> None:
+        """Shut down the GPU worker pool, if one was started."""
+        if self._gpu_pool is not None:
+            atexit.unregister(self.close)
+            self._gpu_pool.shutdown(cancel_futures=True)
+            self._gpu_pool = None
 
-        # Save audio file
-        sf.write(str(output_path), full_audio, self.SAMPLE_RATE)
+    def _generate_batch_audio(self, texts: List[str]) -> List[np.ndarray]:
+        """
+        Generate audio for a batch of sentences.
 
-        total_duration = len(full_audio) / self.SAMPLE_RATE
-        logger.success(f"Generated: {output_path.name} ({total_duration:.1f}s, {len(timed_segments)} segments)")
+        Tortoise's public API synthesizes one text per call, so repeated
+        text (within the batch or anywhere earlier in the run) is served
+        from an LRU cache instead of another inference pass. Failed
+        sentences get 0.5s of silence and are not cached.
+        """
+        results = []
+        for text in texts:
+            key = (self.voice, self.preset, text.strip().lower())
+            audio = self._audio_cache.get(key)
+            if audio is not None:
+                # Hand out a copy so callers can modify it without touching the cache
+                self._audio_cache.move_to_end(key)
+                results.append(audio.copy())
+                continue
+            try:
+                audio = self._generate_sentence_audio(text)
+            except Exception as e:
+                logger.warning(f"Failed to generate audio for sentence '{text[:40]}': {e}")
+                results.append(np.zeros(int(0.5 * self.SAMPLE_RATE), dtype=np.float32))
+                continue
 
-        return output_path, timed_segments
+            self._audio_cache[key] = audio
+            if len(self._audio_cache) > self.AUDIO_CACHE_SIZE:
+                self._audio_cache.popitem(last=False)
+            results.append(audio.copy())
 
-    # Maximum characters per TTS call to prevent OOM errors
-    MAX_CHARS_PER_CHUNK = 200
+        return results
 
-    def _generate_sentence_audio(self, text: str, tts) -> np.ndarray:
+    def _generate_sentence_audio(self, text: str) -> np.ndarray:
         """Generate audio for a single sentence with chunking for long text."""
-        import torch
-        import gc
+        tts = self._get_tts()
 
         # Split very long sentences into chunks to prevent OOM
         if len(text) > self.MAX_CHARS_PER_CHUNK:
             return self._generate_chunked_audio(text, tts)
 
-        # Generate with Tortoise
+        return self._synthesize(text, tts)
+
+    def _synthesize(self, text: str, tts) -> np.ndarray:
+        """Run one Tortoise call and return its audio as float32 numpy."""
+        import torch
+
         audio = tts.tts_with_preset(
             text,
             voice_samples=self._voice_samples,
@@ -223,22 +424,41 @@ class TimedTortoiseTTSGenerator:
             preset=self.preset,
         )
 
-        # Convert tensor to numpy
+        # Convert tensor to numpy (this is what frees the GPU tensor).
+        # Any float32 cast happens before leaving the device, and a
+        # float32 CPU tensor (what Tortoise returns) is shared, not copied.
         if torch.is_tensor(audio):
-            audio = audio.squeeze().cpu().numpy()
+            audio = audio.detach().squeeze()
+            if audio.dtype != torch.float32:
+                audio = audio.float()
+            audio = audio.cpu().numpy()
 
-        # Clean up GPU memory after each sentence
-        if torch.cuda.is_available():
-            torch.cuda.empty_cache()
-        gc.collect()
+        self._release_memory()
 
-        return audio.astype(np.float32)
+        return np.asarray(audio, dtype=np.float32)
+
+    def _release_memory(self, force: bool = False) -> None:
+        """
+        Run gc and release cached CUDA blocks every CLEANUP_INTERVAL calls.
+
+        empty_cache() synchronizes the device and hands memory back that
+        the next call would allocate again, so doing it per sentence is
+        pure overhead; it only matters to keep long runs from creeping.
+        """
+        self._calls_since_cleanup += 1
+        if not force and self._calls_since_cleanup < self.CLEANUP_INTERVAL:
+            return
+        self._calls_since_cleanup = 0
 
-    def _generate_chunked_audio(self, text: str, tts) -> np.ndarray:
-        """Split long text into chunks and generate audio for each."""
         import torch
         import gc
 
+        gc.collect()
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+    def _generate_chunked_audio(self, text: str, tts) -> np.ndarray:
+        """Split long text into chunks and generate audio for each."""
         # Split on punctuation or at max length
         chunks = self._split_text_into_chunks(text)
         audio_parts = []
@@ -247,53 +467,37 @@ class TimedTortoiseTTSGenerator:
             if not chunk.strip():
                 continue
 
-            audio = tts.tts_with_preset(
-                chunk,
-                voice_samples=self._voice_samples,
-                conditioning_latents=self._conditioning_latents,
-                preset=self.preset,
-            )
-
-            if torch.is_tensor(audio):
-                audio = audio.squeeze().cpu().numpy()
-
-            audio_parts.append(audio.astype(np.float32))
-
-            # Clean up memory after each chunk
-            if torch.cuda.is_available():
-                torch.cuda.empty_cache()
-            gc.collect()
+            audio_parts.append(self._synthesize(chunk, tts))
 
         if not audio_parts:
             return np.zeros(int(0.5 * self.SAMPLE_RATE), dtype=np.float32)
 
-        # Add small pause between chunks
-        pause = np.zeros(int(0.1 * self.SAMPLE_RATE), dtype=np.float32)
-        result = []
-        for i, part in enumerate(audio_parts):
-            result.append(part)
-            if i < len(audio_parts) - 1:
-                result.append(pause)
+        # Write parts straight into one buffer, leaving a small pause between chunks
+        pause_samples = int(0.1 * self.SAMPLE_RATE)
+        total = sum(len(part) for part in audio_parts) + (len(audio_parts) - 1) * pause_samples
+        result = np.zeros(total, dtype=np.float32)
+        pos = 0
+        for part in audio_parts:
+            result[pos:pos + len(part)] = part
+            pos += len(part) + pause_samples
 
-        return np.concatenate(result)
+        return result
 
     def _split_text_into_chunks(self, text: str) -> list:
         """Split text into smaller chunks at natural break points."""
-        import re
-
         # First try to split on sentence-ending punctuation
         chunks = []
         current = ""
 
         # Split on commas, semicolons, colons, or natural phrase breaks
-        parts = re.split(r'([,;:\-\u2014])\s*', text)
+        parts = _CHUNK_SPLIT_RE.split(text)
 
         for i, part in enumerate(parts):
             if not part:
                 continue
 
             # If it's a delimiter, add it to current
-            if re.match(r'^[,;:\-\u2014]$', part):
+            if part in _CHUNK_DELIMITERS:
                 current += part
                 continue
 
@@ -328,52 +532,6 @@ class TimedTortoiseTTSGenerator:
 
         return final_chunks
 
-    def _normalize(self, audio: np.ndarray) -> np.ndarray:
-        """Normalize audio to target dB level."""
-        rms = np.sqrt(np.mean(audio ** 2))
-        if rms == 0:
-            return audio
-
-        current_db = 20 * np.log10(rms)
-        gain_db = self.target_db - current_db
-        gain = 10 ** (gain_db / 20)
-
-        normalized = audio * gain
-        normalized = np.clip(normalized, -1.0, 1.0)
-
-        return normalized
-
-    def generate_chapter_timed(
-        self,
-        chapter: dict,
-        output_dir: Path,
-        chapter_num: int,
-    ) -> Tuple[Path, List[TimedSegment]]:
-        """
-        Generate timed audio for a chapter.
-
-        Args:
-            chapter: Chapter dict with 'title' and 'text'
-            output_dir: Output directory
-            chapter_num: Chapter number
-
-        Returns:
-            Tuple of (audio path, timed segments)
-        """
-        output_dir = Path(output_dir)
-        output_dir.mkdir(parents=True, exist_ok=True)
-
-        chapter_id = f"ch{chapter_num:02d}"
-        output_path = output_dir / f"{chapter_id}.wav"
-
-        logger.step(f"Chapter {chapter_num}: {chapter['title'][:50]}")
-
-        return self.generate_timed_audio(
-            chapter["text"],
-            output_path,
-            chapter_id=chapter_id,
-        )
-
 
 # Alias for drop-in replacement
 TimedTTSGenerator = TimedTortoiseTTSGenerator
@@ -385,7 +543,7 @@ def generate_with_timing(
     voice: Optional[str] = None,
     preset: str = "fast",
     chapter_id: str = "ch01",
-) -> Tuple[Path, List[TimedSegment]]:
+) -> Tuple[Path, TimedSegments]:
     """
     Convenience function to generate audio with timing.
 
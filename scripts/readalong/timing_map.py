@@ -8,16 +8,38 @@ Supports JSON export for web reader synchronization.
 import json
 from dataclasses import dataclass, field, asdict
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Optional, Dict, Any, Tuple
 
 from scripts.readalong.sentence_splitter import Sentence
-from scripts.readalong.timed_tts import TimedSegment
 from scripts.utils import logger
 
+if TYPE_CHECKING:
+    # Importing timed_tts selects and loads a TTS engine; only needed for hints
+    from scripts.readalong.timed_tts import TimedSegment
 
-@dataclass
+# orjson is optional: when available, timing maps are encoded and parsed
+# in C instead of through json's pure-Python indenting encoder
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def segment_rows(segments: Iterable["TimedSegment"]) -> Iterator[Tuple[str, str, float, float]]:
+    """
+    Iterate (id, text, start, end) for timed segments.
+
+    Uses the column fast path of TimedSegments when available, so no
+    per-segment record objects are created.
+    """
+    if hasattr(segments, "rows"):
+        return segments.rows()
+    return ((s.sentence_id, s.text, s.start_time, s.end_time) for s in segments)
+
+
+@dataclass(slots=True, frozen=True)
 class TimingEntry:
-    """Single timing entry linking audio time to text."""
+    """Single timing entry linking audio time to text (immutable once built)."""
 
     id: str  # Sentence/segment ID
     start: float  # Start time in seconds
@@ -25,12 +47,17 @@ class TimingEntry:
     text: str  # The text content
     paragraph: int = 0  # Paragraph index
 
+    def __post_init__(self) -> None:
+        # Times are exported to the millisecond; round once here
+        object.__setattr__(self, "start", round(self.start, 3))
+        object.__setattr__(self, "end", round(self.end, 3))
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON export."""
         return {
             "id": self.id,
-            "start": round(self.start, 3),
-            "end": round(self.end, 3),
+            "start": self.start,
+            "end": self.end,
             "text": self.text,
             "paragraph": self.paragraph,
         }
@@ -85,8 +112,11 @@ class BookTimingMap:
         output_path = Path(output_path).with_suffix(".json")
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+        if orjson is not None:
+            output_path.write_bytes(orjson.dumps(self.to_dict(), option=orjson.OPT_INDENT_2))
+        else:
+            with open(output_path, "w", encoding="utf-8") as f:
+                f.write(json.dumps(self.to_dict(), indent=2, ensure_ascii=False))
 
         logger.success(f"Saved timing map: {output_path}")
         return output_path
@@ -94,8 +124,11 @@ class BookTimingMap:
     @classmethod
     def load(cls, path: Path) -> "BookTimingMap":
         """Load timing map from JSON file."""
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        if orjson is not None:
+            data = orjson.loads(Path(path).read_bytes())
+        else:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
 
         chapters = []
         for ch_data in data.get("chapters", []):
@@ -190,7 +223,7 @@ class TimingMap:
 
     def add_entries_from_segments(
         self,
-        segments: List[TimedSegment],
+        segments: List["TimedSegment"],
         sentences: Optional[List[Sentence]] = None,
     ) -> "TimingMap":
         """
@@ -206,22 +239,26 @@ class TimingMap:
         if not self._current_chapter:
             raise ValueError("Must call add_chapter first")
 
-        # Create lookup for sentences
-        sentence_lookup = {}
-        if sentences:
-            sentence_lookup = {s.id: s for s in sentences}
+        # Segments normally line up 1:1 with the sentences they were
+        # generated from; the id lookup is only built on a mismatch
+        sentences = sentences or []
+        paragraph_lookup: Optional[Dict[str, int]] = None
 
-        for segment in segments:
+        for i, (sentence_id, text, start, end) in enumerate(segment_rows(segments)):
             # Get paragraph from sentence if available
             paragraph = 0
-            if segment.sentence_id in sentence_lookup:
-                paragraph = sentence_lookup[segment.sentence_id].paragraph_id
+            if i < len(sentences) and sentences[i].id == sentence_id:
+                paragraph = sentences[i].paragraph_id
+            elif sentences:
+                if paragraph_lookup is None:
+                    paragraph_lookup = {s.id: s.paragraph_id for s in sentences}
+                paragraph = paragraph_lookup.get(sentence_id, 0)
 
             entry = TimingEntry(
-                id=segment.sentence_id,
-                start=segment.start_time,
-                end=segment.end_time,
-                text=segment.text,
+                id=sentence_id,
+                start=start,
+                end=end,
+                text=text,
                 paragraph=paragraph,
             )
             self._current_chapter.entries.append(entry)
@@ -292,7 +329,7 @@ class TimingMap:
 
 
 def create_timing_from_segments(
-    segments: List[TimedSegment],
+    segments: List["TimedSegment"],
     chapter_id: str,
     chapter_title: str,
     audio_file: str,
@@ -312,14 +349,14 @@ def create_timing_from_segments(
     entries = []
     duration = 0.0
 
-    for segment in segments:
+    for sentence_id, text, start, end in segment_rows(segments):
         entries.append(TimingEntry(
-            id=segment.sentence_id,
-            start=segment.start_time,
-            end=segment.end_time,
-            text=segment.text,
+            id=sentence_id,
+            start=start,
+            end=end,
+            text=text,
         ))
-        duration = max(duration, segment.end_time)
+        duration = max(duration, end)
 
     return ChapterTiming(
         chapter_id=chapter_id,
@@ -332,13 +369,13 @@ def create_timing_from_segments(
 
 if __name__ == "__main__":
     # Test timing map creation
-    from scripts.readalong.timed_tts import TimedSegment
+    from scripts.readalong.timed_tts import TimedSegment as Segment
 
     # Create test segments
     segments = [
-        TimedSegment("ch01_s0000", "This is the first sentence.", 0.0, 2.5),
-        TimedSegment("ch01_s0001", "This is the second sentence.", 2.8, 5.0),
-        TimedSegment("ch01_s0002", "And this is the third.", 5.3, 7.0),
+        Segment("ch01_s0000", "This is the first sentence.", 0.0, 2.5),
+        Segment("ch01_s0001", "This is the second sentence.", 2.8, 5.0),
+        Segment("ch01_s0002", "And this is the third.", 5.3, 7.0),
     ]
 
     # Build timing map
@@ -2,10 +2,23 @@
 import requests
 import json
 import sys
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 BASE_URL = "http://localhost:13378"
 USERNAME = "root"
 PASSWORD = "1234"
+TIMEOUT = 5  # seconds per request
+
+# One keep-alive connection for every call. Connection errors are retried
+# with backoff while Audiobookshelf is still starting; status retries only
+# apply to idempotent requests, so the library is never created twice.
+session = requests.Session()
+session.mount("http://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=4,
+    max_retries=Retry(total=10, connect=10, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+))
 
 def setup_library():
     # 1. Login
@@ -16,7 +29,7 @@ def setup_library():
     }
     
     try:
-        res = requests.post(f"{BASE_URL}/login", json=login_payload)
+        res = session.post(f"{BASE_URL}/login", json=login_payload, timeout=TIMEOUT)
         if res.status_code != 200:
             # If login fails, maybe it's the first time setup?
             # Audiobookshelf usually requires creating the first user.
@@ -31,10 +44,10 @@ def setup_library():
             return False
             
         print("Login successful.")
-        headers = {"Authorization": f"Bearer {token}"}
+        session.headers["Authorization"] = f"Bearer {token}"
         
         # 2. Check libraries
-        res = requests.get(f"{BASE_URL}/api/libraries", headers=headers)
+        res = session.get(f"{BASE_URL}/api/libraries", timeout=TIMEOUT)
         libraries = res.json().get("libraries", [])
         print(f"Found {len(libraries)} libraries.")
         
@@ -61,7 +74,7 @@ def setup_library():
             }
         }
         
-        res = requests.post(f"{BASE_URL}/api/libraries", json=library_payload, headers=headers)
+        res = session.post(f"{BASE_URL}/api/libraries", json=library_payload, timeout=TIMEOUT)
         if res.status_code == 200:
             print("Library created successfully.")
             return True
@@ -3,17 +3,48 @@ Configuration loader for the audiobook generation system.
 """
 
 import os
+import re
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import yaml
 
+# Marks a key path that is absent from the config
+_MISSING = object()
+
 
 class Config:
-    """Configuration manager for audiobook generation."""
+    """
+    Configuration manager for audiobook generation.
+
+    The commonly read settings are resolved once at load time into plain
+    (slotted) attributes; anything else goes through get().
+    """
+
+    __slots__ = (
+        "_config",
+        "project_root",
+        "voice",
+        "voice_speed",
+        "sample_rate",
+        "m4b_bitrate",
+        "use_gpu",
+        "voice_preset",
+        "chapter_patterns",
+    )
 
     _instance: Optional["Config"] = None
-    _config: Dict[str, Any] = {}
+
+    _config: Dict[str, Any]
+    project_root: Path  # Project root directory
+    voice: str  # Default voice
+    voice_speed: float  # Voice speed
+    sample_rate: int  # Audio sample rate
+    m4b_bitrate: str  # m4b bitrate
+    use_gpu: bool  # Whether the GPU should be used
+    voice_preset: str  # TTS quality preset
+    chapter_patterns: List[re.Pattern]  # Chapter heading patterns, compiled
 
     def __new__(cls) -> "Config":
         if cls._instance is None:
@@ -21,7 +52,7 @@ class Config:
         return cls._instance
 
     def __init__(self) -> None:
-        if not self._config:
+        if getattr(self, "_config", None) is None:
             self._load_config()
 
     def _get_project_root(self) -> Path:
@@ -31,8 +62,9 @@ class Config:
         return current.parent.parent.parent
 
     def _load_config(self) -> None:
-        """Load configuration from YAML file."""
-        config_path = self._get_project_root() / "config" / "settings.yaml"
+        """Load configuration from YAML file and resolve the common settings."""
+        self.project_root = self._get_project_root()
+        config_path = self.project_root / "config" / "settings.yaml"
 
         if config_path.exists():
             with open(config_path, "r", encoding="utf-8") as f:
@@ -41,6 +73,22 @@ class Config:
             # Use defaults if config doesn't exist
             self._config = self._get_defaults()
 
+        self._lookup.cache_clear()
+        self.voice = self.get("voice", "default", default="af_sky")
+        self.voice_speed = self.get("voice", "speed", default=0.95)
+        self.sample_rate = self.get("audio", "sample_rate", default=24000)
+        self.m4b_bitrate = self.get("audio", "m4b", "bitrate", default="64k")
+        self.use_gpu = self.get("processing", "use_gpu", default=True)
+        self.voice_preset = self.get("voice", "preset", default="fast")
+        self.chapter_patterns = [
+            re.compile(pattern, re.MULTILINE | re.IGNORECASE)
+            for pattern in self.get("chapters", "patterns", default=[
+                r"^Chapter\s+\d+",
+                r"^CHAPTER\s+\d+",
+                r"^Part\s+\d+",
+            ])
+        ]
+
     def _get_defaults(self) -> Dict[str, Any]:
         """Return default configuration."""
         return {
@@ -90,55 +138,26 @@ class Config:
         Example:
             config.get("voice", "default") -> "af_sky"
         """
+        value = self._lookup(keys)
+        return default if value is _MISSING else value
+
+    @lru_cache(maxsize=None)
+    def _lookup(self, keys: Tuple[str, ...]) -> Any:
+        """Walk the config for a key path once; repeat lookups hit the cache."""
         value = self._config
         for key in keys:
             if isinstance(value, dict):
                 value = value.get(key)
             else:
-                return default
+                return _MISSING
             if value is None:
-                return default
+                return _MISSING
         return value
 
     def get_path(self, key: str) -> Path:
         """Get a path configuration as absolute Path."""
         relative_path = self.get("paths", key, default=key)
-        return self._get_project_root() / relative_path
-
-    @property
-    def project_root(self) -> Path:
-        """Get the project root directory."""
-        return self._get_project_root()
-
-    @property
-    def voice(self) -> str:
-        """Get the default voice."""
-        return self.get("voice", "default", default="af_sky")
-
-    @property
-    def voice_speed(self) -> float:
-        """Get the voice speed."""
-        return self.get("voice", "speed", default=0.95)
-
-    @property
-    def sample_rate(self) -> int:
-        """Get the audio sample rate."""
-        return self.get("audio", "sample_rate", default=24000)
-
-    @property
-    def m4b_bitrate(self) -> str:
-        """Get the m4b bitrate."""
-        return self.get("audio", "m4b", "bitrate", default="64k")
-
-    @property
-    def use_gpu(self) -> bool:
-        """Check if GPU should be used."""
-        return self.get("processing", "use_gpu", default=True)
-
-    @property
-    def voice_preset(self) -> str:
-        """Get the TTS quality preset."""
-        return self.get("voice", "preset", default="fast")
+        return self.project_root / relative_path
 
 
 # Singleton instance
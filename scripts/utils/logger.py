@@ -68,7 +68,7 @@ def header(message: str) -> None:
     console.print()
 
 
-def create_progress() -> Progress:
+def create_progress(disable: bool = False) -> Progress:
     """Create a progress bar for long-running operations."""
     return Progress(
         SpinnerColumn(),
@@ -78,6 +78,7 @@ def create_progress() -> Progress:
         TimeElapsedColumn(),
         TimeRemainingColumn(),
         console=console,
+        disable=disable,
     )
 
 
@@ -0,0 +1,101 @@
+"""
+Disk cache for Tortoise voice conditioning latents.
+
+Shared by the standalone and read-along Tortoise generators so both read
+and write the same <voice>.latents.<hash> file next to the custom voices.
+"""
+
+import hashlib
+import importlib.util
+import os
+import tempfile
+from pathlib import Path
+from typing import List, Optional
+
+from scripts.utils import logger
+
+# Latents are stored as safetensors when available: the file is
+# memory-mapped, so GPU workers share the page cache instead of each
+# unpickling a private copy
+LATENTS_SUFFIX = ".safetensors" if importlib.util.find_spec("safetensors") else ".pt"
+
+# Every format a cache file may have been written in, for stale cleanup
+_ALL_SUFFIXES = (".safetensors", ".pt")
+
+
+def cache_path(voices_dir: Path, voice: str, clips: List[str]) -> Optional[Path]:
+    """
+    Cache file for a voice's latents, or None if it has no clips.
+
+    The hash covers the voice clips' paths and mtimes, so editing the
+    clips invalidates the cache.
+    """
+    if not clips:
+        return None
+
+    stamp = hashlib.sha1(
+        "\n".join(f"{clip}:{os.path.getmtime(clip)}" for clip in sorted(clips)).encode()
+    ).hexdigest()[:16]
+    return Path(voices_dir) / f"{voice}.latents.{stamp}{LATENTS_SUFFIX}"
+
+
+def read_latents(path: Path):
+    """Load cached latents (a tuple of tensors) on the CPU."""
+    if path.suffix == ".safetensors":
+        from safetensors.torch import load_file
+
+        tensors = load_file(str(path), device="cpu")
+        return tuple(tensors[f"latent_{i}"] for i in range(len(tensors)))
+
+    import torch
+
+    return torch.load(path, map_location="cpu")
+
+
+def write_latents(voice: str, conditioning_latents, path: Path) -> None:
+    """
+    Save latents to path, replacing the voice's stale cache files.
+
+    The file is written under a temporary name in the same directory and
+    moved into place, so concurrent readers (e.g. GPU workers) never see
+    a partial file. Stale caches in either format are removed afterwards,
+    so switching between the safetensors and .pt formats does not leave
+    old files behind. A failed write only logs a warning.
+    """
+    if path.exists():
+        return
+
+    tmp_path = None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        os.close(fd)
+        tmp_path = Path(tmp_name)
+
+        if path.suffix == ".safetensors":
+            from safetensors.torch import save_file
+
+            save_file(
+                {
+                    f"latent_{i}": latent.detach().cpu().contiguous()
+                    for i, latent in enumerate(conditioning_latents)
+                },
+                str(tmp_path),
+            )
+        else:
+            import torch
+
+            torch.save(conditioning_latents, tmp_path)
+
+        os.replace(tmp_path, path)
+        tmp_path = None
+
+        for suffix in _ALL_SUFFIXES:
+            for stale in path.parent.glob(f"{voice}.latents.*{suffix}"):
+                if stale.name != path.name:
+                    stale.unlink(missing_ok=True)
+    except Exception as e:
+        logger.warning(f"Could not cache conditioning latents: {e}")
+    finally:
+        if tmp_path is not None:
+            tmp_path.unlink(missing_ok=True)
@@ -5,96 +5,341 @@ Required for audio seeking in the web reader.
 
 Usage: python serve.py [port]
 Default port: 8000
+Set SERVE_VERBOSE=1 to log every request (errors are always logged).
 """
 
+import datetime
+import email.utils
+import mimetypes
 import os
+import re
+import shutil
+import socket
+import stat
 import sys
-import mimetypes
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 
+# Single byte range: "bytes=start-end", "bytes=start-" or suffix "bytes=-length".
+# Positions are capped at 19 ASCII digits so int() only ever sees small values
+_RANGE_RE = re.compile(rb"^bytes=([0-9]{0,19})-([0-9]{0,19})$")
+
+# Headers every response carries, pre-encoded once
+_FIXED_HEADERS = b"Accept-Ranges: bytes\r\nAccess-Control-Allow-Origin: *\r\n"
+_KEEP_ALIVE_HEADER = b"Connection: keep-alive\r\n"
+
+# Per-request access lines are noise while the player seeks; errors still log
+_VERBOSE = os.environ.get("SERVE_VERBOSE", "") not in ("", "0")
+
+# Userspace copy size when sendfile is unavailable, sized to the send buffer
+# instead of the 8-64 KiB stdlib defaults
+_COPY_CHUNK = 256 * 1024
+
+# Descriptors kept open across requests for the same file (e.g. audio seeks).
+# Entries idle longer than _FD_POOL_IDLE are closed on the next lookup. On
+# Windows an open handle stops the file being replaced or deleted, so chapters
+# regenerated while the server runs would fail; pooling is disabled there.
+_FD_POOL_SIZE = 0 if os.name == "nt" else 64
+_FD_POOL_IDLE = 30.0
+_fd_pool = OrderedDict()
+_fd_pool_lock = threading.Lock()
+
+# Precompressed siblings checked for text assets, in order of preference
+_PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+_COMPRESSIBLE_TYPES = {"application/javascript", "application/json", "image/svg+xml"}
+
+# Content types for the files the reader actually serves; anything else
+# falls back to mimetypes.guess_type
+_EXT_MAP = {
+    ".mp3": "audio/mpeg",
+    ".m4b": "audio/mp4",
+    ".m4a": "audio/mp4",
+    ".opus": "audio/ogg",
+    ".wav": "audio/wav",
+    ".html": "text/html; charset=utf-8",
+    ".js": "application/javascript",
+    ".css": "text/css",
+    ".json": "application/json",
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".webp": "image/webp",
+    ".vtt": "text/vtt",
+}
+
 
 class RangeHTTPRequestHandler(SimpleHTTPRequestHandler):
     """HTTP handler that supports Range requests for audio/video seeking."""
 
+    # Keep connections open across the many small range requests a seek makes
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        try:
+            # Header-only seek responses shouldn't wait on Nagle, and a large
+            # send buffer lets each sendfile() call move more of the file
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.connection.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4 * 1024 * 1024)
+        except OSError:
+            pass
+
+    def translate_path(self, path):
+        # Clean ASCII paths (nearly every request) skip the unquote/normalize pass
+        path = path.split("?", 1)[0].split("#", 1)[0]
+        if "%" in path or ".." in path or "//" in path or "\\" in path or ":" in path:
+            return super().translate_path(path)
+        return os.path.join(self.directory, path.lstrip("/"))
+
     def send_head(self):
         path = self.translate_path(self.path)
 
-        if os.path.isdir(path):
+        try:
+            st = os.stat(path)
+        except (OSError, ValueError):
+            # ValueError: embedded NUL byte (e.g. "/a%00b")
+            self.send_error(404, "File not found")
+            return None
+
+        if stat.S_ISDIR(st.st_mode):
             return super().send_head()
 
-        if not os.path.isfile(path):
+        if not stat.S_ISREG(st.st_mode):
             self.send_error(404, "File not found")
             return None
 
         # Get file info
-        file_size = os.path.getsize(path)
-        content_type, _ = mimetypes.guess_type(path)
-        if content_type is None:
-            content_type = "application/octet-stream"
+        file_size = st.st_size
+        ext = path[path.rfind("."):].lower()
+        content_type = _EXT_MAP.get(ext) or (
+            mimetypes.guess_type(path)[0] or "application/octet-stream"
+        )
 
         # Check for Range header
         range_header = self.headers.get("Range")
 
+        # Text assets may have a .br/.gz built alongside them; ranges are
+        # only served from the identity encoding
+        content_encoding = None
+        compressible = (
+            content_type.startswith("text/")
+            or content_type in _COMPRESSIBLE_TYPES
+        )
+        if compressible and not range_header:
+            path, st, content_encoding = self._precompressed(path, st)
+            file_size = st.st_size
+
+        # Validators let the reader revalidate cached chapters with a 304
+        etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+        last_modified = email.utils.formatdate(st.st_mtime, usegmt=True)
+        if self._not_modified(etag, st.st_mtime):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", last_modified)
+            if compressible:
+                self.send_header("Vary", "Accept-Encoding")
+            self.end_headers()
+            return None
+
         if range_header:
-            try:
-                # Parse range (e.g., "bytes=1000-2000" or "bytes=1000-")
-                range_spec = range_header.replace("bytes=", "")
-                parts = range_spec.split("-")
-                start = int(parts[0]) if parts[0] else 0
-                end = int(parts[1]) if parts[1] else file_size - 1
-                end = min(end, file_size - 1)
-                length = end - start + 1
-
-                self.send_response(206)
-                self.send_header("Content-Type", content_type)
-                self.send_header("Content-Length", str(length))
-                self.send_header("Content-Range", f"bytes {start}-{end}/{file_size}")
-                self.send_header("Accept-Ranges", "bytes")
-                self.send_header("Access-Control-Allow-Origin", "*")
-                self.end_headers()
-
-                f = open(path, "rb")
-                f.seek(start)
-                return _RangeFile(f, length)
-
-            except (ValueError, IndexError):
-                self.send_error(416, "Invalid range")
+            # Header values are latin-1 decoded, so this round-trips exactly
+            # and lets the match run on the ASCII-only bytes path.
+            # Multi-range (multipart/byteranges) isn't supported; refuse it
+            # before parsing so clients retry with a single range
+            raw_range = range_header.encode("latin-1")
+            m = None if b"," in raw_range else _RANGE_RE.match(raw_range)
+            if not m or not (m.group(1) or m.group(2)):
+                self._send_range_not_satisfiable(file_size)
                 return None
+
+            first, last = m.group(1), m.group(2)
+            if first and last and int(last) < int(first):
+                # "bytes=5-2" is an invalid spec rather than an unsatisfiable
+                # one: ignore the header and send the whole file
+                range_header = None
+
+        if range_header:
+            if first:
+                start = int(first)
+                end = min(int(last), file_size - 1) if last else file_size - 1
+            else:
+                # Suffix form: the final N bytes of the file
+                start = max(0, file_size - int(last))
+                end = file_size - 1
+            if start > end:
+                self._send_range_not_satisfiable(file_size)
+                return None
+            length = end - start + 1
+
+            self.send_response(206)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(length))
+            self.send_header("Content-Range", f"bytes {start}-{end}/{file_size}")
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", last_modified)
+            self.end_headers()
+
+            return _SendFileSpec(_get_fd(path, st), start, length)
         else:
-            # Normal request - still advertise Range support
+            # Normal request - end_headers still advertises Range support
             self.send_response(200)
             self.send_header("Content-Type", content_type)
             self.send_header("Content-Length", str(file_size))
-            self.send_header("Accept-Ranges", "bytes")
-            self.send_header("Access-Control-Allow-Origin", "*")
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", last_modified)
+            if content_encoding:
+                self.send_header("Content-Encoding", content_encoding)
+            if compressible:
+                self.send_header("Vary", "Accept-Encoding")
             self.end_headers()
-            return open(path, "rb")
+            return _SendFileSpec(_get_fd(path, st), 0, file_size)
+
+    def log_request(self, code="-", size="-"):
+        if _VERBOSE:
+            super().log_request(code, size)
+
+    def end_headers(self):
+        if hasattr(self, "_headers_buffer"):
+            self._headers_buffer.append(_FIXED_HEADERS)
+            # Advertise keep-alive unless the client (or send_error) is closing
+            if not self.close_connection:
+                self._headers_buffer.append(_KEEP_ALIVE_HEADER)
+        super().end_headers()
+
+    def _precompressed(self, path, st):
+        """Swap in a precompressed sibling of path if the client accepts it."""
+        accepted = {
+            token.split(";", 1)[0].strip()
+            for token in self.headers.get("Accept-Encoding", "").split(",")
+        }
+        for encoding, suffix in _PRECOMPRESSED:
+            if encoding not in accepted:
+                continue
+            try:
+                compressed_st = os.stat(path + suffix)
+            except OSError:
+                continue
+            if stat.S_ISREG(compressed_st.st_mode):
+                return path + suffix, compressed_st, encoding
+        return path, st, None
+
+    def _send_range_not_satisfiable(self, file_size):
+        """Reply 416 with the current length so the client can retry."""
+        self.send_response(416)
+        self.send_header("Content-Range", f"bytes */{file_size}")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _not_modified(self, etag, mtime):
+        """Check If-None-Match / If-Modified-Since against the file's validators."""
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            # If-None-Match takes precedence over If-Modified-Since
+            tags = [t.strip() for t in if_none_match.split(",")]
+            return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since is None:
+            return False
+        try:
+            since = email.utils.parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError, IndexError, OverflowError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=datetime.timezone.utc)
+        return int(mtime) <= since.timestamp()
+
+    def copyfile(self, source, outputfile):
+        """Send file bodies with socket.sendfile so bytes never enter userspace."""
+        if not isinstance(source, _SendFileSpec):
+            # Directory listings and index pages come from the stock send_head
+            shutil.copyfileobj(source, outputfile, _COPY_CHUNK)
+            return
+
+        try:
+            # Headers must be on the wire before the raw socket write
+            outputfile.flush()
+            with open(source.fd, "rb", buffering=0, closefd=False) as f:
+                if hasattr(os, "sendfile"):
+                    sent = self.connection.sendfile(f, source.offset, source.length)
+                else:
+                    # socket.sendfile would fall back to 8 KiB send() calls
+                    f.seek(source.offset)
+                    sent = 0
+                    while sent < source.length:
+                        data = f.read(min(source.length - sent, _COPY_CHUNK))
+                        if not data:
+                            break
+                        outputfile.write(data)
+                        sent += len(data)
+            if sent < source.length:
+                # File shrank after the stat; the promised Content-Length can't
+                # be met, so the client must not read another response here
+                self.close_connection = True
+        except (BrokenPipeError, ConnectionResetError):
+            # Client went away mid-transfer (e.g. seeking in the player)
+            self.close_connection = True
+        finally:
+            source.close()
+
+
+def _file_identity(st):
+    return st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns
+
+
+def _get_fd(path, st):
+    """Return a private descriptor for path, dup'd from the pool when possible."""
+    if not _FD_POOL_SIZE:
+        return os.open(path, os.O_RDONLY)
+
+    identity = _file_identity(st)
+    now = time.monotonic()
+    with _fd_pool_lock:
+        # Close anything nobody has asked for recently
+        while _fd_pool:
+            oldest = next(iter(_fd_pool.values()))
+            if now - oldest[2] <= _FD_POOL_IDLE:
+                break
+            os.close(_fd_pool.popitem(last=False)[1][0])
+
+        entry = _fd_pool.pop(path, None)
+        if entry is not None:
+            # The path may now name a different file, or the pooled file may
+            # have been rewritten in place; only reuse an exact match
+            if entry[1] == identity and _file_identity(os.fstat(entry[0])) == identity:
+                _fd_pool[path] = (entry[0], identity, now)
+                return os.dup(entry[0])
+            os.close(entry[0])
 
+        fd = os.open(path, os.O_RDONLY)
+        _fd_pool[path] = (fd, identity, now)
+        while len(_fd_pool) > _FD_POOL_SIZE:
+            os.close(_fd_pool.popitem(last=False)[1][0])
+        return os.dup(fd)
 
-class _RangeFile:
-    """Wrapper to read only a portion of a file."""
 
-    def __init__(self, f, length):
-        self.f = f
-        self.remaining = length
+@dataclass
+class _SendFileSpec:
+    """Byte span of an open file descriptor to send as a response body."""
 
-    def read(self, size=-1):
-        if self.remaining <= 0:
-            return b""
-        if size < 0 or size > self.remaining:
-            size = self.remaining
-        data = self.f.read(size)
-        self.remaining -= len(data)
-        return data
+    fd: int
+    offset: int
+    length: int
 
     def close(self):
-        self.f.close()
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
 
 
 def main():
     port = int(sys.argv[1]) if len(sys.argv) > 1 else 8000
-    server = HTTPServer(("", port), RangeHTTPRequestHandler)
+    server = ThreadingHTTPServer(("", port), RangeHTTPRequestHandler)
+    # Don't let an idle browser connection hold up Ctrl+C
+    server.daemon_threads = True
     print(f"Serving at http://localhost:{port}")
     print(f"Open http://localhost:{port}/web/library.html")
     print("Press Ctrl+C to stop")
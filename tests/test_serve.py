@@ -0,0 +1,75 @@
+"""Range handling tests for serve.py."""
+
+import http.client
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from functools import partial
+from http.server import ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from serve import RangeHTTPRequestHandler  # noqa: E402
+
+BODY = bytes(range(256)) * 4
+
+
+class RangeRequestTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        with open(os.path.join(cls.tmp.name, "chapter.mp3"), "wb") as f:
+            f.write(BODY)
+        handler = partial(RangeHTTPRequestHandler, directory=cls.tmp.name)
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        cls.server.daemon_threads = True
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.tmp.cleanup()
+
+    def get(self, range_header=None):
+        conn = http.client.HTTPConnection(*self.server.server_address, timeout=5)
+        headers = {"Range": range_header} if range_header else {}
+        try:
+            conn.request("GET", "/chapter.mp3", headers=headers)
+            response = conn.getresponse()
+            return response.status, response.getheaders(), response.read()
+        finally:
+            conn.close()
+
+    def test_full_body(self):
+        status, _, body = self.get()
+        self.assertEqual(status, 200)
+        self.assertEqual(body, BODY)
+
+    def test_closed_range(self):
+        status, headers, body = self.get("bytes=5-9")
+        self.assertEqual(status, 206)
+        self.assertIn(("Content-Range", f"bytes 5-9/{len(BODY)}"), headers)
+        self.assertEqual(body, BODY[5:10])
+
+    def test_suffix_range(self):
+        status, _, body = self.get("bytes=-4")
+        self.assertEqual(status, 206)
+        self.assertEqual(body, BODY[-4:])
+
+    def test_last_before_first_is_ignored(self):
+        status, headers, body = self.get("bytes=5-2")
+        self.assertEqual(status, 200)
+        self.assertNotIn("Content-Range", dict(headers))
+        self.assertEqual(body, BODY)
+
+    def test_start_past_end_is_unsatisfiable(self):
+        status, headers, _ = self.get(f"bytes={len(BODY)}-")
+        self.assertEqual(status, 416)
+        self.assertIn(("Content-Range", f"bytes */{len(BODY)}"), headers)
+
+
+if __name__ == "__main__":
+    unittest.main()